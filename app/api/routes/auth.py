@@ -1,5 +1,5 @@
 import secrets
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime, timedelta
@@ -24,7 +24,7 @@ from app.services.auth import (
     get_current_user,
     hash_password,
 )
-from app.services.notifications import notification_service
+from app.services.notifications import notification_service, send_email_after_response
 from app.models.user import User
 
 settings = get_settings()
@@ -34,6 +34,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 @router.post("/register", response_model=Token)
 async def register(
     user_data: UserRegister,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Register a new user."""
@@ -48,13 +49,13 @@ async def register(
     # Create user
     user = await create_user(db, user_data)
 
-    # Send welcome email (don't block registration if email fails)
-    try:
-        await notification_service.send_welcome_email(user.email, user.name)
-    except Exception as e:
-        # Log but don't fail registration
-        import logging
-        logging.getLogger(__name__).warning(f"Failed to send welcome email: {e}")
+    # Send welcome email after responding (failures are logged, never fail registration)
+    await send_email_after_response(
+        background_tasks,
+        notification_service.send_welcome_email,
+        to_email=user.email,
+        user_name=user.name
+    )
 
     # Create token
     access_token = create_access_token(
@@ -173,6 +174,7 @@ async def logout():
 @router.post("/forgot-password")
 async def forgot_password(
     request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Request password reset email."""
@@ -186,8 +188,10 @@ async def forgot_password(
         user.password_reset_expires = datetime.utcnow() + timedelta(hours=1)
         await db.commit()
 
-        # Send email
-        await notification_service.send_password_reset_email(
+        # Send email after responding, so known and unknown addresses answer equally fast
+        await send_email_after_response(
+            background_tasks,
+            notification_service.send_password_reset_email,
             to_email=user.email,
             reset_token=token,
             user_name=user.name
@@ -1,5 +1,5 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import stripe
 
@@ -24,6 +24,7 @@ from app.services.billing import (
     handle_subscription_deleted,
     TIER_TO_PRICE,
 )
+from app.services.notifications import send_email_after_response
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -188,6 +189,7 @@ async def get_prices():
 @router.post("/webhook")
 async def stripe_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Handle Stripe webhooks."""
@@ -217,11 +219,11 @@ async def stripe_webhook(
         # Handle successful checkout - subscription is created separately
         logger.info(f"Checkout completed: {data.get('id')}")
     elif event_type == "customer.subscription.created":
-        await handle_subscription_created(data, db)
+        await handle_subscription_created(data, db, background_tasks)
     elif event_type == "customer.subscription.updated":
         await handle_subscription_updated(data, db)
     elif event_type == "customer.subscription.deleted":
-        await handle_subscription_deleted(data, db)
+        await handle_subscription_deleted(data, db, background_tasks)
     elif event_type == "invoice.payment_failed":
         logger.warning(f"Payment failed for subscription: {data.get('subscription')}")
         # Send payment failed email
@@ -235,13 +237,12 @@ async def stripe_webhook(
             )
             user = result.scalar_one_or_none()
             if user:
-                try:
-                    await notification_service.send_payment_failed_email(
-                        to_email=user.email,
-                        user_name=user.name
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to send payment failed email: {e}")
+                await send_email_after_response(
+                    background_tasks,
+                    notification_service.send_payment_failed_email,
+                    to_email=user.email,
+                    user_name=user.name
+                )
     elif event_type == "invoice.paid":
         logger.info(f"Invoice paid for subscription: {data.get('subscription')}")
 
@@ -6,13 +6,14 @@ from app.config import get_settings
 
 settings = get_settings()
 
-# SQLAlchemy async engine
+# SQLAlchemy async engine - one pool per process, shared by every AsyncSessionLocal
+# session (API requests, the data collector, pattern engine)
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
 )
 
 # Session factory
@@ -10,6 +10,7 @@ from app.api.routes import markets, patterns, auth, billing, insights, cross_pla
 from app.services.data_collector import data_collector
 from app.services.kalshi_client import kalshi_client
 from app.services.polymarket_client import polymarket_client
+from app.services.notifications import notification_service
 
 settings = get_settings()
 
@@ -163,17 +164,11 @@ async def send_daily_digest_emails():
                     "score": insight.interest_score or 50
                 })
 
-            sent_count = 0
-            for user in users:
-                try:
-                    await notification_service.send_daily_digest(
-                        to_email=user.email,
-                        opportunities=opportunities,
-                        user_name=user.name
-                    )
-                    sent_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to send digest to {user.email}: {e}")
+            # One SendGrid request per 1000 recipients instead of one per user
+            sent_count = await notification_service.send_digest_bulk(
+                [(user.email, user.name) for user in users],
+                opportunities
+            )
 
             logger.info(f"Sent {sent_count} daily digest emails")
 
@@ -183,68 +178,15 @@ async def send_daily_digest_emails():
 
 async def process_alert_emails():
     """Process pending alert emails in batches."""
-    from sqlalchemy import select, and_
-    from datetime import datetime
-    from app.core.database import AsyncSessionLocal
-    from app.models.market import Alert
-    from app.models.user import User
-    from app.services.notifications import notification_service
+    from app.services.notifications import send_pending_alert_emails
 
     logger.info("Processing pending alert emails...")
 
-    async with AsyncSessionLocal() as session:
-        try:
-            # Find alerts that haven't been emailed yet
-            result = await session.execute(
-                select(Alert).where(
-                    and_(
-                        Alert.email_sent == False,
-                        Alert.user_id.isnot(None)
-                    )
-                ).limit(50)  # Process in batches
-            )
-            alerts = result.scalars().all()
-
-            if not alerts:
-                logger.info("No pending alert emails")
-                return
-
-            sent_count = 0
-            for alert in alerts:
-                # Get the user
-                user_result = await session.execute(
-                    select(User).where(User.id == alert.user_id)
-                )
-                user = user_result.scalar_one_or_none()
-
-                if not user or not user.email_alerts_enabled:
-                    # Mark as sent to skip in future
-                    alert.email_sent = True
-                    continue
-
-                try:
-                    await notification_service.send_alert_email(
-                        to_email=user.email,
-                        alert={
-                            "title": alert.title,
-                            "message": alert.message,
-                            "action_suggestion": alert.action_suggestion,
-                            "pattern_type": alert.min_tier,
-                            "score": 70  # Default score
-                        },
-                        user_name=user.name
-                    )
-                    alert.email_sent = True
-                    alert.email_sent_at = datetime.utcnow()
-                    sent_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to send alert email: {e}")
-
-            await session.commit()
-            logger.info(f"Sent {sent_count} alert emails")
-
-        except Exception as e:
-            logger.error(f"Error in process_alert_emails: {e}")
+    try:
+        sent_count = await send_pending_alert_emails()
+        logger.info(f"Sent {sent_count} alert emails")
+    except Exception as e:
+        logger.error(f"Error in process_alert_emails: {e}")
 
 
 @asynccontextmanager
@@ -312,6 +254,7 @@ async def lifespan(app: FastAPI):
         scheduler.shutdown(wait=False)
     await kalshi_client.close()
     await polymarket_client.close()
+    await notification_service.aclose()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -3,11 +3,12 @@ from typing import Optional
 from datetime import datetime, timedelta
 
 import stripe
+from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.models.user import User, SubscriptionTier, SubscriptionStatus
-from app.services.notifications import notification_service
+from app.services.notifications import notification_service, send_email_after_response
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -131,7 +132,11 @@ async def create_billing_portal_session(user: User, db: AsyncSession) -> dict:
     return {"portal_url": session.url}
 
 
-async def handle_subscription_created(subscription: dict, db: AsyncSession) -> None:
+async def handle_subscription_created(
+    subscription: dict,
+    db: AsyncSession,
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> None:
     """Handle subscription.created webhook."""
     from app.services.auth import get_user_by_id
 
@@ -178,22 +183,23 @@ async def handle_subscription_created(subscription: dict, db: AsyncSession) -> N
     logger.info(f"Updated user {user.id} subscription to {tier.value}")
 
     # Send trial started email
-    try:
-        if subscription.get("status") == "trialing":
-            await notification_service.send_trial_started_email(
-                to_email=user.email,
-                user_name=user.name,
-                tier=tier.value,
-                trial_end=user.trial_end
-            )
-        else:
-            await notification_service.send_subscription_confirmed_email(
-                to_email=user.email,
-                user_name=user.name,
-                tier=tier.value
-            )
-    except Exception as e:
-        logger.warning(f"Failed to send subscription email: {e}")
+    if subscription.get("status") == "trialing":
+        await send_email_after_response(
+            background_tasks,
+            notification_service.send_trial_started_email,
+            to_email=user.email,
+            user_name=user.name,
+            tier=tier.value,
+            trial_end=user.trial_end
+        )
+    else:
+        await send_email_after_response(
+            background_tasks,
+            notification_service.send_subscription_confirmed_email,
+            to_email=user.email,
+            user_name=user.name,
+            tier=tier.value
+        )
 
 
 async def handle_subscription_updated(subscription: dict, db: AsyncSession) -> None:
@@ -238,7 +244,11 @@ async def handle_subscription_updated(subscription: dict, db: AsyncSession) -> N
     logger.info(f"Updated user {user.id} subscription status to {user.subscription_status.value}")
 
 
-async def handle_subscription_deleted(subscription: dict, db: AsyncSession) -> None:
+async def handle_subscription_deleted(
+    subscription: dict,
+    db: AsyncSession,
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> None:
     """Handle subscription.deleted webhook."""
     from sqlalchemy import select
 
@@ -262,14 +272,13 @@ async def handle_subscription_deleted(subscription: dict, db: AsyncSession) -> N
     logger.info(f"Canceled subscription for user {user.id}")
 
     # Send cancellation email
-    try:
-        await notification_service.send_subscription_cancelled_email(
-            to_email=user.email,
-            user_name=user.name,
-            tier=old_tier.value if old_tier else "BASIC"
-        )
-    except Exception as e:
-        logger.warning(f"Failed to send cancellation email: {e}")
+    await send_email_after_response(
+        background_tasks,
+        notification_service.send_subscription_cancelled_email,
+        to_email=user.email,
+        user_name=user.name,
+        tier=old_tier.value if old_tier else "BASIC"
+    )
 
 
 async def get_subscription_info(user: User) -> Optional[dict]:
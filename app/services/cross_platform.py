@@ -9,6 +9,7 @@ PHILOSOPHY: We are a RESEARCH COMPANION, not an arbitrage tool.
 We inform and contextualize, not recommend bets.
 """
 import re
+import json
 import asyncio
 import logging
 from datetime import datetime, timedelta
@@ -162,12 +163,14 @@ class MatchedMarket:
     kalshi_volume: Optional[float] = None
     kalshi_close_time: Optional[datetime] = None
     kalshi_url: Optional[str] = None
+    kalshi_external_id: Optional[str] = None  # kalshi_id without the "kalshi_" prefix
     poly_id: Optional[str] = None
     poly_title: Optional[str] = None
     poly_price: Optional[float] = None
     poly_volume: Optional[float] = None
     poly_close_time: Optional[datetime] = None
     polymarket_url: Optional[str] = None
+    poly_external_id: Optional[str] = None  # poly_id without the "poly_" prefix
 
 
 class CrossPlatformService:
@@ -237,12 +240,14 @@ class CrossPlatformService:
                 kalshi_volume=row[6],
                 kalshi_close_time=row[7],
                 kalshi_url=row[14],  # From JOIN with markets table
+                kalshi_external_id=row[3].removeprefix("kalshi_") if row[3] else None,
                 poly_id=row[8],
                 poly_title=row[9],
                 poly_price=row[10],
                 poly_volume=row[11],
                 poly_close_time=row[12],
                 polymarket_url=row[15],  # From JOIN with markets table
+                poly_external_id=row[8].removeprefix("poly_") if row[8] else None,
             )
             matches.append(matched)
 
@@ -476,7 +481,6 @@ RULES:
                 response_format={"type": "json_object"}
             )
 
-            import json
             result = json.loads(response.choices[0].message.content)
             logger.info(f"AI analysis generated for {match.match_id}")
             return result
@@ -562,7 +566,6 @@ RULES:
                 response_format={"type": "json_object"}
             )
 
-            import json
             result = json.loads(response.choices[0].message.content)
             headlines = []
             for h in result.get("headlines", [])[:3]:
@@ -740,8 +743,8 @@ RULES:
             kalshi_volume=match.kalshi_volume or 0,
             polymarket_volume=match.poly_volume or 0,
             combined_volume=(match.kalshi_volume or 0) + (match.poly_volume or 0),
-            kalshi_url=f"https://kalshi.com/markets/{match.kalshi_id.replace('kalshi_', '')}" if match.kalshi_id else None,
-            polymarket_url=f"https://polymarket.com/event/{match.poly_id.replace('poly_', '')}" if match.poly_id else None,
+            kalshi_url=f"https://kalshi.com/markets/{match.kalshi_external_id}" if match.kalshi_external_id else None,
+            polymarket_url=f"https://polymarket.com/event/{match.poly_external_id}" if match.poly_external_id else None,
             last_updated=datetime.utcnow(),
             data_freshness="live",
         )
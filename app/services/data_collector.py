@@ -1,29 +1,182 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Dict, Iterable, List, Tuple, NamedTuple
 import json
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.dialects.postgresql import insert
 import redis.asyncio as redis
 
 from app.core.database import AsyncSessionLocal, get_redis
 from app.models.market import Market, MarketSnapshot, Platform
+from app.schemas.market import KalshiMarketData, PolymarketMarketData
 from app.services.kalshi_client import kalshi_client
 from app.services.polymarket_client import polymarket_client
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row upsert; keeps each statement well under PostgreSQL's 65535 bind-parameter limit
+UPSERT_BATCH_SIZE = 1000
+
+# Columns refreshed when a market already exists
+KALSHI_UPDATE_COLUMNS = ("yes_price", "no_price", "volume", "status", "image_url", "url")
+POLYMARKET_UPDATE_COLUMNS = ("yes_price", "no_price", "volume", "liquidity", "image_url", "url")
+
+# Snapshot record layouts for COPY (id and timestamp come from column defaults)
+KALSHI_SNAPSHOT_COLUMNS = ("market_id", "yes_price", "no_price", "volume", "best_bid", "best_ask", "spread")
+POLYMARKET_SNAPSHOT_COLUMNS = ("market_id", "yes_price", "no_price", "volume", "volume_24h", "best_ask", "spread")
+
+MARKET_CACHE_TTL = 3600  # 1 hour
+LAST_COLLECTION_TTL = 86400  # 1 day
+
+# Market hashes per cache script call. Redis runs a script to completion before
+# serving other clients, so a full collection is written in short calls.
+CACHE_BATCH_SIZE = 500
+
+# HSET + EXPIRE for every market hash in one server-side call.
+# KEYS: market hash keys. ARGV: ttl, then per key: field count, field1, value1, ...
+# Hashes whose price/volume fields are unchanged only get their TTL refreshed
+# (updated_at is not compared, so it records when the values last changed).
+# Returns the number of hashes actually rewritten.
+CACHE_MARKETS_LUA = """
+local ttl = ARGV[1]
+local pos = 2
+local written = 0
+for _, key in ipairs(KEYS) do
+    local nfields = tonumber(ARGV[pos])
+    local fields = {}
+    local changed = false
+    for j = 1, nfields * 2, 2 do
+        local field = ARGV[pos + j]
+        local value = ARGV[pos + j + 1]
+        fields[j] = field
+        fields[j + 1] = value
+        if not changed and field ~= 'updated_at' and redis.call('HGET', key, field) ~= value then
+            changed = true
+        end
+    end
+    if changed then
+        redis.call('HSET', key, unpack(fields))
+        written = written + 1
+    end
+    redis.call('EXPIRE', key, ttl)
+    pos = pos + 1 + nfields * 2
+end
+return written
+"""
+
+
+_UTC = timezone.utc
+
 
 def to_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
     """Convert timezone-aware datetime to naive UTC datetime for database storage."""
-    if dt is None:
-        return None
-    if dt.tzinfo is not None:
-        # Convert to UTC and strip timezone info
-        return dt.astimezone(timezone.utc).replace(tzinfo=None)
-    return dt
+    # None and naive datetimes pass through; aware ones are converted to UTC and stripped
+    return dt.astimezone(_UTC).replace(tzinfo=None) if dt is not None and dt.tzinfo is not None else dt
+
+
+class PreparedMarket(NamedTuple):
+    """One collected market shaped for the database and cache writes."""
+    market_id: str
+    row: dict  # Market upsert values
+    snapshot: tuple  # MarketSnapshot COPY record
+    cache_key: str
+    cache_mapping: Dict[str, str]
+
+
+def _shape_kalshi_market(market_data: KalshiMarketData, now_iso: str) -> PreparedMarket:
+    """Shape a Kalshi market into upsert, snapshot and cache payloads."""
+    market_id = f"kalshi_{market_data.ticker}"
+    yes_price = market_data.yes_ask if market_data.yes_ask else market_data.yes_bid
+    no_price = market_data.no_ask if market_data.no_ask else market_data.no_bid
+
+    row = dict(
+        id=market_id,
+        platform=Platform.KALSHI,
+        title=market_data.title,
+        description=market_data.subtitle,
+        category=market_data.category,
+        image_url=market_data.image_url,
+        url=market_data.url,
+        yes_price=yes_price,
+        no_price=no_price,
+        volume=market_data.volume,
+        status=market_data.status,
+        close_time=to_naive_utc(market_data.close_time),
+    )
+
+    # Order matches KALSHI_SNAPSHOT_COLUMNS
+    snapshot = (
+        market_id,
+        yes_price,
+        no_price,
+        market_data.volume,
+        market_data.yes_bid,
+        market_data.yes_ask,
+        (market_data.yes_ask - market_data.yes_bid) if market_data.yes_ask and market_data.yes_bid else None,
+    )
+
+    cache_mapping = {
+        "yes_price": str(yes_price or 0),
+        "no_price": str(no_price or 0),
+        "volume": str(market_data.volume or 0),
+        "updated_at": now_iso,
+    }
+
+    return PreparedMarket(market_id, row, snapshot, f"market:{market_id}", cache_mapping)
+
+
+def _shape_polymarket_market(market_data: PolymarketMarketData, now_iso: str) -> PreparedMarket:
+    """Shape a Polymarket market into upsert, snapshot and cache payloads."""
+    market_id = f"poly_{market_data.condition_id}"
+
+    # Get yes/no prices from outcomes
+    yes_price = None
+    no_price = None
+    if len(market_data.outcome_prices) >= 2:
+        yes_price = market_data.outcome_prices[0]
+        no_price = market_data.outcome_prices[1]
+    elif len(market_data.outcome_prices) == 1:
+        yes_price = market_data.outcome_prices[0]
+
+    row = dict(
+        id=market_id,
+        platform=Platform.POLYMARKET,
+        title=market_data.question,
+        description=market_data.description,
+        category=market_data.category,
+        image_url=market_data.image_url,
+        url=market_data.url,
+        yes_price=yes_price,
+        no_price=no_price,
+        volume=market_data.volume,
+        liquidity=market_data.liquidity,
+        status="active",
+        close_time=to_naive_utc(market_data.end_date),
+    )
+
+    # All available snapshot data; order matches POLYMARKET_SNAPSHOT_COLUMNS
+    snapshot = (
+        market_id,
+        yes_price,
+        no_price,
+        market_data.volume,
+        market_data.volume_24h,
+        market_data.best_ask,
+        market_data.spread,
+    )
+
+    cache_mapping = {
+        "yes_price": str(yes_price or 0),
+        "no_price": str(no_price or 0),
+        "volume": str(market_data.volume or 0),
+        "liquidity": str(market_data.liquidity or 0),
+        "updated_at": now_iso,
+    }
+
+    return PreparedMarket(market_id, row, snapshot, f"market:{market_id}", cache_mapping)
 
 
 class DataCollector:
@@ -31,191 +184,153 @@ class DataCollector:
 
     def __init__(self):
         self._redis: Optional[redis.Redis] = None
+        self._redis_lock = asyncio.Lock()
+        self._cache_script = None
 
     async def get_redis(self) -> redis.Redis:
         if self._redis is None:
-            self._redis = await get_redis()
+            # Concurrent first callers wait for a single initialization
+            async with self._redis_lock:
+                if self._redis is None:
+                    self._redis = await get_redis()
         return self._redis
 
-    async def collect_kalshi_markets(self, session: AsyncSession) -> int:
-        """Collect markets from Kalshi and store in database."""
-        try:
-            markets = await kalshi_client.fetch_all_markets()
-            count = 0
-
-            for market_data in markets:
-                # Upsert market
-                market_id = f"kalshi_{market_data.ticker}"
-                yes_price = market_data.yes_ask if market_data.yes_ask else market_data.yes_bid
-                no_price = market_data.no_ask if market_data.no_ask else market_data.no_bid
-
-                stmt = insert(Market).values(
-                    id=market_id,
-                    platform=Platform.KALSHI,
-                    title=market_data.title,
-                    description=market_data.subtitle,
-                    category=market_data.category,
-                    image_url=market_data.image_url,
-                    url=market_data.url,
-                    yes_price=yes_price,
-                    no_price=no_price,
-                    volume=market_data.volume,
-                    status=market_data.status,
-                    close_time=to_naive_utc(market_data.close_time),
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["id"],
-                    set_={
-                        "yes_price": stmt.excluded.yes_price,
-                        "no_price": stmt.excluded.no_price,
-                        "volume": stmt.excluded.volume,
-                        "status": stmt.excluded.status,
-                        "image_url": stmt.excluded.image_url,
-                        "url": stmt.excluded.url,
-                        "updated_at": datetime.utcnow(),
-                    }
-                )
-                await session.execute(stmt)
-
-                # Create snapshot
-                snapshot = MarketSnapshot(
-                    market_id=market_id,
-                    yes_price=yes_price,
-                    no_price=no_price,
-                    volume=market_data.volume,
-                    best_bid=market_data.yes_bid,
-                    best_ask=market_data.yes_ask,
-                    spread=(market_data.yes_ask - market_data.yes_bid) if market_data.yes_ask and market_data.yes_bid else None,
-                )
-                session.add(snapshot)
-
-                # Cache in Redis
-                r = await self.get_redis()
-                await r.hset(
-                    f"market:{market_id}",
-                    mapping={
-                        "yes_price": str(yes_price or 0),
-                        "no_price": str(no_price or 0),
-                        "volume": str(market_data.volume or 0),
-                        "updated_at": datetime.utcnow().isoformat(),
-                    }
-                )
-                await r.expire(f"market:{market_id}", 3600)  # 1 hour TTL
-
-                count += 1
-
-            await session.commit()
-            logger.info(f"Collected {count} Kalshi markets")
-            return count
-
-        except Exception as e:
-            logger.error(f"Error collecting Kalshi markets: {e}")
-            await session.rollback()
-            raise
-
-    async def collect_polymarket_markets(self, session: AsyncSession) -> int:
-        """Collect markets from Polymarket and store in database."""
-        try:
-            markets = await polymarket_client.fetch_all_markets()
-            count = 0
-
-            for market_data in markets:
-                if not market_data.condition_id:
-                    continue
-
-                market_id = f"poly_{market_data.condition_id}"
-
-                # Get yes/no prices from outcomes
-                yes_price = None
-                no_price = None
-                if len(market_data.outcome_prices) >= 2:
-                    yes_price = market_data.outcome_prices[0]
-                    no_price = market_data.outcome_prices[1]
-                elif len(market_data.outcome_prices) == 1:
-                    yes_price = market_data.outcome_prices[0]
-
-                stmt = insert(Market).values(
-                    id=market_id,
-                    platform=Platform.POLYMARKET,
-                    title=market_data.question,
-                    description=market_data.description,
-                    category=market_data.category,
-                    image_url=market_data.image_url,
-                    url=market_data.url,
-                    yes_price=yes_price,
-                    no_price=no_price,
-                    volume=market_data.volume,
-                    liquidity=market_data.liquidity,
-                    status="active",
-                    close_time=to_naive_utc(market_data.end_date),
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["id"],
-                    set_={
-                        "yes_price": stmt.excluded.yes_price,
-                        "no_price": stmt.excluded.no_price,
-                        "volume": stmt.excluded.volume,
-                        "liquidity": stmt.excluded.liquidity,
-                        "image_url": stmt.excluded.image_url,
-                        "url": stmt.excluded.url,
-                        "updated_at": datetime.utcnow(),
-                    }
-                )
-                await session.execute(stmt)
-
-                # Create snapshot with all available data
-                snapshot = MarketSnapshot(
-                    market_id=market_id,
-                    yes_price=yes_price,
-                    no_price=no_price,
-                    volume=market_data.volume,
-                    volume_24h=market_data.volume_24h,
-                    best_ask=market_data.best_ask,
-                    spread=market_data.spread,
-                )
-                session.add(snapshot)
-
-                # Cache in Redis
-                r = await self.get_redis()
-                await r.hset(
-                    f"market:{market_id}",
-                    mapping={
-                        "yes_price": str(yes_price or 0),
-                        "no_price": str(no_price or 0),
-                        "volume": str(market_data.volume or 0),
-                        "liquidity": str(market_data.liquidity or 0),
-                        "updated_at": datetime.utcnow().isoformat(),
-                    }
-                )
-                await r.expire(f"market:{market_id}", 3600)
-
-                count += 1
-
-            await session.commit()
-            logger.info(f"Collected {count} Polymarket markets")
-            return count
-
-        except Exception as e:
-            logger.error(f"Error collecting Polymarket markets: {e}")
-            await session.rollback()
-            raise
+    async def _upsert_markets(
+        self,
+        session: AsyncSession,
+        rows: Dict[str, dict],
+        update_columns: Iterable[str],
+    ) -> None:
+        """Upsert market rows with one multi-row INSERT ... ON CONFLICT per batch.
+
+        Rows are keyed by market id so a market listed twice in one fetch is only
+        written once (PostgreSQL rejects a statement that updates a row twice).
+        """
+        values = list(rows.values())
+        for start in range(0, len(values), UPSERT_BATCH_SIZE):
+            stmt = insert(Market).values(values[start:start + UPSERT_BATCH_SIZE])
+            set_ = {column: stmt.excluded[column] for column in update_columns}
+            set_["updated_at"] = func.now()  # Server-side, no bind parameter
+            stmt = stmt.on_conflict_do_update(index_elements=["id"], set_=set_)
+            await session.execute(stmt)
+
+    async def _cache_markets(self, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        """Write changed market hashes to Redis, one Lua script call per CACHE_BATCH_SIZE markets."""
+        if not entries:
+            return
+        r = await self.get_redis()
+        if self._cache_script is None:
+            self._cache_script = r.register_script(CACHE_MARKETS_LUA)
+
+        written = 0
+        for start in range(0, len(entries), CACHE_BATCH_SIZE):
+            keys = []
+            args = [MARKET_CACHE_TTL]
+            for key, mapping in entries[start:start + CACHE_BATCH_SIZE]:
+                keys.append(key)
+                args.append(len(mapping))
+                for field, value in mapping.items():
+                    args.append(field)
+                    args.append(value)
+            written += await self._cache_script(keys=keys, args=args)
+        logger.debug(f"Cached {written} changed of {len(entries)} markets")
+
+    async def _copy_snapshots(
+        self,
+        session: AsyncSession,
+        records: List[tuple],
+        columns: Tuple[str, ...],
+    ) -> None:
+        """Append snapshot records with PostgreSQL's binary COPY protocol.
+
+        Runs on the session's asyncpg connection, inside the same transaction
+        as the market upsert, so the rows commit (or roll back) together.
+        """
+        if not records:
+            return
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            MarketSnapshot.__tablename__,
+            records=records,
+            columns=columns,
+        )
+
+    async def _store_prepared(
+        self,
+        session: AsyncSession,
+        prepared: List[PreparedMarket],
+        update_columns: Iterable[str],
+        snapshot_columns: Tuple[str, ...],
+    ) -> None:
+        """Write a batch of shaped markets to PostgreSQL (cached separately, after commit)."""
+        # Upsert markets first so the snapshots' foreign keys resolve
+        await self._upsert_markets(session, {p.market_id: p.row for p in prepared}, update_columns)
+        await self._copy_snapshots(session, [p.snapshot for p in prepared], snapshot_columns)
+
+    async def fetch_kalshi_markets(self, now_iso: str) -> List[PreparedMarket]:
+        """Fetch markets from Kalshi and shape them for storage."""
+        markets = await kalshi_client.fetch_all_markets()
+        return [_shape_kalshi_market(m, now_iso) for m in markets]
+
+    async def fetch_polymarket_markets(self, now_iso: str) -> List[PreparedMarket]:
+        """Fetch markets from Polymarket and shape them for storage."""
+        markets = await polymarket_client.fetch_all_markets()
+        return [_shape_polymarket_market(m, now_iso) for m in markets if m.condition_id]
 
     async def run_collection(self, run_pattern_detection: bool = True) -> dict:
         """Run full data collection from all platforms."""
         results = {"kalshi": 0, "polymarket": 0, "patterns": 0, "errors": []}
 
+        # One timestamp for every cached market in this run
+        now_iso = datetime.utcnow().isoformat()
+
+        # Fetch both platforms concurrently; only the network calls overlap
+        kalshi_result, poly_result = await asyncio.gather(
+            self.fetch_kalshi_markets(now_iso),
+            self.fetch_polymarket_markets(now_iso),
+            return_exceptions=True,
+        )
+
+        batches = (
+            ("Kalshi", "kalshi", kalshi_result, KALSHI_UPDATE_COLUMNS, KALSHI_SNAPSHOT_COLUMNS),
+            ("Polymarket", "polymarket", poly_result, POLYMARKET_UPDATE_COLUMNS, POLYMARKET_SNAPSHOT_COLUMNS),
+        )
+
+        # Write both batches in one transaction with a single commit. Each
+        # platform gets its own savepoint so a failed write only discards
+        # that platform's rows.
+        cache_entries: List[Tuple[str, Dict[str, str]]] = []
         async with AsyncSessionLocal() as session:
-            try:
-                results["kalshi"] = await self.collect_kalshi_markets(session)
-            except Exception as e:
-                results["errors"].append(f"Kalshi: {str(e)}")
-                logger.error(f"Kalshi collection failed: {e}")
+            for label, key, batch, update_columns, snapshot_columns in batches:
+                if not isinstance(batch, Exception):
+                    try:
+                        async with session.begin_nested():
+                            await self._store_prepared(session, batch, update_columns, snapshot_columns)
+                        cache_entries.extend((p.cache_key, p.cache_mapping) for p in batch)
+                        results[key] = len(batch)
+                        logger.info(f"Collected {len(batch)} {label} markets")
+                        continue
+                    except Exception as e:
+                        batch = e
+                results["errors"].append(f"{label}: {str(batch)}")
+                logger.error(f"{label} collection failed: {batch}")
 
             try:
-                results["polymarket"] = await self.collect_polymarket_markets(session)
+                await session.commit()
             except Exception as e:
-                results["errors"].append(f"Polymarket: {str(e)}")
-                logger.error(f"Polymarket collection failed: {e}")
+                await session.rollback()
+                cache_entries = []
+                results["kalshi"] = results["polymarket"] = 0
+                results["errors"].append(f"Commit: {str(e)}")
+                logger.error(f"Committing collected markets failed: {e}")
+
+        # Cache only committed markets, so Redis never advertises rows the database lacks
+        try:
+            await self._cache_markets(cache_entries)
+        except Exception as e:
+            results["errors"].append(f"Cache: {str(e)}")
+            logger.error(f"Caching collected markets failed: {e}")
 
         # Run pattern detection after data collection
         if run_pattern_detection:
@@ -231,7 +346,7 @@ class DataCollector:
 
         # Update last collection timestamp
         r = await self.get_redis()
-        await r.set("last_collection", datetime.utcnow().isoformat())
+        await r.set("last_collection", datetime.utcnow().isoformat(), ex=LAST_COLLECTION_TTL)
 
         logger.info(f"Data collection complete: {results}")
         return results
@@ -3,15 +3,26 @@ SendGrid Email Service for OddWons.
 
 Handles all transactional emails with branded templates.
 """
+import gzip
+import json
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from functools import lru_cache
+from html import escape
+from typing import Optional, List, Dict, Any, Tuple, NamedTuple
+from datetime import date, datetime
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
+import httpx
 
 from app.config import get_settings
 
+try:
+    # orjson encodes straight to bytes and is several times faster than json
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
@@ -23,10 +34,28 @@ BRAND_SUCCESS = "#22c55e"
 BRAND_WARNING = "#f59e0b"
 BRAND_ERROR = "#ef4444"
 
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
 
-def get_base_template(content: str, preview_text: str = "") -> str:
-    """Wrap content in branded email template."""
-    return f"""
+# Request bodies at least this large are gzipped before upload; the templated
+# HTML compresses several times over
+SENDGRID_GZIP_MIN_BYTES = 1024
+
+# SendGrid accepts up to 1000 personalizations per /mail/send request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+# Characters of each insight summary shown in the digest
+DIGEST_SUMMARY_LENGTH = 150
+
+# Alert emails in flight at once during batch processing (here and in the scheduler job)
+ALERT_EMAIL_CONCURRENCY = 20
+# Alerts claimed per run. Their row locks are held and their ids marked sent in
+# one transaction, so the cap bounds both and how much a crash can re-send.
+ALERT_EMAIL_BATCH_SIZE = 500
+
+
+# Email skeletons are built once at import with the brand colors baked in;
+# each send only fills in the per-email fields with str.format.
+_BASE_TEMPLATE = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -42,7 +71,7 @@ def get_base_template(content: str, preview_text: str = "") -> str:
 <body style="margin: 0; padding: 0; background-color: #f3f4f6; font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">
     <!-- Preview text -->
     <div style="display: none; max-height: 0; overflow: hidden;">
-        {preview_text}
+        {{preview_text}}
     </div>
 
     <!-- Email container -->
@@ -63,7 +92,7 @@ def get_base_template(content: str, preview_text: str = "") -> str:
                     <!-- Main content -->
                     <tr>
                         <td style="padding: 40px 32px;">
-                            {content}
+                            {{content}}
                         </td>
                     </tr>
 
@@ -77,7 +106,7 @@ def get_base_template(content: str, preview_text: str = "") -> str:
                                             Compare markets | AI insights | Real-time alerts
                                         </p>
                                         <p style="margin: 0; font-size: 12px; color: #9ca3af;">
-                                            © {datetime.now().year} OddWons. All rights reserved.
+                                            © {{year}} OddWons. All rights reserved.
                                         </p>
                                         <p style="margin: 8px 0 0 0; font-size: 12px; color: #9ca3af;">
                                             <a href="https://oddwons.ai/settings" style="color: {BRAND_PRIMARY}; text-decoration: none;">Manage preferences</a>
@@ -98,10 +127,7 @@ def get_base_template(content: str, preview_text: str = "") -> str:
 </html>
 """
 
-
-def button(text: str, url: str, color: str = BRAND_PRIMARY) -> str:
-    """Generate a styled button."""
-    return f"""
+_BUTTON_TEMPLATE = """
     <table role="presentation" cellspacing="0" cellpadding="0" style="margin: 24px 0;">
         <tr>
             <td style="background-color: {color}; border-radius: 8px;">
@@ -113,74 +139,155 @@ def button(text: str, url: str, color: str = BRAND_PRIMARY) -> str:
     </table>
     """
 
-
-def info_box(content: str, emoji: str = "") -> str:
-    """Generate an info box."""
-    prefix = f"{emoji} " if emoji else ""
-    return f"""
+_INFO_BOX_TEMPLATE = f"""
     <div style="background-color: {BRAND_LIGHT}; border-left: 4px solid {BRAND_PRIMARY}; padding: 16px; border-radius: 0 8px 8px 0; margin: 20px 0;">
         <p style="margin: 0; color: #0c4a6e; font-size: 14px;">
-            {prefix}{content}
+            {{prefix}}{{content}}
         </p>
     </div>
     """
 
-
-def feature_list(features: List[str]) -> str:
-    """Generate a feature list with checkmarks."""
-    items = "".join([f"""
+_FEATURE_ROW_TEMPLATE = f"""
         <tr>
             <td style="padding: 8px 0; color: #374151; font-size: 15px;">
-                <span style="color: {BRAND_SUCCESS}; margin-right: 8px;">✓</span> {feature}
+                <span style="color: {BRAND_SUCCESS}; margin-right: 8px;">✓</span> {{feature}}
             </td>
         </tr>
-    """ for feature in features])
-    return f"""
+    """
+
+_FEATURE_LIST_TEMPLATE = """
     <table role="presentation" cellspacing="0" cellpadding="0" style="margin: 16px 0;">
-        {items}
+        {rows}
     </table>
     """
 
+_TIER_BADGE_TEMPLATE = """<span style="display: inline-block; background-color: {bg_color}; color: {text_color}; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 600;">{tier}</span>"""
+
+# Tier -> (text color, background color)
+_TIER_BADGE_COLORS = {
+    "FREE": ("#6b7280", "#f3f4f6"),
+    "BASIC": ("#0ea5e9", "#e0f2fe"),
+    "PREMIUM": ("#8b5cf6", "#ede9fe"),
+    "PRO": ("#f59e0b", "#fef3c7"),
+}
+
+
+@lru_cache(maxsize=8)
+def _format_day(day: date, fmt: str) -> str:
+    """strftime once per (day, format); batch sends all format the same date."""
+    return day.strftime(fmt)
+
+
+def _today(fmt: str) -> str:
+    """Format today's local date."""
+    return _format_day(date.today(), fmt)
+
+
+# Layout before and after the content slot; formatted pieces are cached so
+# each email only concatenates its own content between them
+_BASE_HEAD, _BASE_TAIL = _BASE_TEMPLATE.split("{content}")
+
+
+@lru_cache(maxsize=256)
+def _base_head(preview_text: str) -> str:
+    return _BASE_HEAD.format(preview_text=preview_text)
+
+
+@lru_cache(maxsize=2)
+def _base_tail(year: int) -> str:
+    return _BASE_TAIL.format(year=year)
+
+
+def get_base_template(content: str, preview_text: str = "") -> str:
+    """Wrap content in branded email template."""
+    # Year is read per render so long-running workers roll over on Jan 1
+    return _base_head(preview_text) + content + _base_tail(datetime.now().year)
+
+
+def button(text: str, url: str, color: str = BRAND_PRIMARY) -> str:
+    """Generate a styled button."""
+    return _BUTTON_TEMPLATE.format(color=color, url=url, text=text)
+
+
+def info_box(content: str, emoji: str = "") -> str:
+    """Generate an info box."""
+    prefix = f"{emoji} " if emoji else ""
+    return _INFO_BOX_TEMPLATE.format(prefix=prefix, content=content)
+
+
+def feature_list(features: List[str]) -> str:
+    """Generate a feature list with checkmarks."""
+    rows = "".join(_FEATURE_ROW_TEMPLATE.format(feature=feature) for feature in features)
+    return _FEATURE_LIST_TEMPLATE.format(rows=rows)
+
 
 def tier_badge(tier: str) -> str:
     """Generate a tier badge."""
-    colors = {
-        "FREE": ("#6b7280", "#f3f4f6"),
-        "BASIC": ("#0ea5e9", "#e0f2fe"),
-        "PREMIUM": ("#8b5cf6", "#ede9fe"),
-        "PRO": ("#f59e0b", "#fef3c7"),
-    }
-    text_color, bg_color = colors.get(tier.upper(), colors["FREE"])
-    return f"""<span style="display: inline-block; background-color: {bg_color}; color: {text_color}; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 600;">{tier.upper()}</span>"""
+    tier = tier.upper()
+    text_color, bg_color = _TIER_BADGE_COLORS.get(tier, _TIER_BADGE_COLORS["FREE"])
+    return _TIER_BADGE_TEMPLATE.format(bg_color=bg_color, text_color=text_color, tier=tier)
 
 
 # =============================================================================
 # EMAIL FUNCTIONS
 # =============================================================================
 
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared SendGrid HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {settings.sendgrid_api_key}"},
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0),
+            http2=True,
+        )
+    return _http_client
+
+
+async def post_to_sendgrid(payload: Dict[str, Any]) -> httpx.Response:
+    """POST a v3 /mail/send payload on the shared client."""
+    body = json_dumps(payload)
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= SENDGRID_GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return await get_http_client().post(SENDGRID_SEND_URL, content=body, headers=headers)
+
+
+async def close_http_client():
+    """Close the shared SendGrid HTTP client."""
+    global _http_client
+    if _http_client:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def send_email(
     to_email: str,
     subject: str,
     html_content: str,
     from_email: str = None
 ) -> bool:
-    """Send email via SendGrid."""
+    """Send email via the SendGrid v3 API."""
     if not settings.sendgrid_api_key:
         logger.warning("SendGrid API key not configured - skipping email")
         return False
 
-    try:
-        sg = SendGridAPIClient(settings.sendgrid_api_key)
-
-        message = Mail(
-            from_email=Email(from_email or settings.from_email, "OddWons"),
-            to_emails=To(to_email),
-            subject=subject,
-            html_content=Content("text/html", html_content)
-        )
+    payload = {
+        "personalizations": [{"to": [{"email": to_email}]}],
+        "from": {"email": from_email or settings.from_email, "name": "OddWons"},
+        "subject": subject,
+        "content": [{"type": "text/html", "value": html_content}],
+    }
 
-        response = sg.send(message)
-        logger.info(f"Email sent to {to_email}: {subject} (status: {response.status_code})")
+    try:
+        response = await post_to_sendgrid(payload)
+        # Per-send detail is debug-level and formatted lazily; batch totals are logged at info
+        logger.debug("Email sent to %s: %s (status: %s)", to_email, subject, response.status_code)
         return response.status_code in [200, 201, 202]
 
     except Exception as e:
@@ -192,13 +299,9 @@ async def send_email(
 # AUTH EMAILS
 # -----------------------------------------------------------------------------
 
-async def send_welcome_email(to_email: str, name: str = None) -> bool:
-    """Welcome email after registration."""
-    display_name = name or to_email.split('@')[0]
-
-    content = f"""
+_WELCOME_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
-            Welcome aboard, {display_name}!
+            Welcome aboard, {{display_name}}!
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             You just joined the smartest prediction market community. We're pumped to have you here!
@@ -225,6 +328,13 @@ async def send_welcome_email(to_email: str, name: str = None) -> bool:
         </p>
     """
 
+
+async def send_welcome_email(to_email: str, name: str = None) -> bool:
+    """Welcome email after registration."""
+    display_name = escape(name or to_email.split('@')[0])
+
+    content = _WELCOME_CONTENT.format(display_name=display_name)
+
     return await send_email(
         to_email=to_email,
         subject="Welcome to OddWons! Your prediction market journey starts now",
@@ -232,23 +342,18 @@ async def send_welcome_email(to_email: str, name: str = None) -> bool:
     )
 
 
-async def send_password_reset_email(to_email: str, reset_token: str, name: str = None) -> bool:
-    """Password reset request email."""
-    display_name = name or "there"
-    reset_url = f"https://oddwons.ai/reset-password?token={reset_token}"
-
-    content = f"""
+_PASSWORD_RESET_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             Reset your password
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, we got a request to reset your OddWons password. No worries - it happens to the best of us!
+            Hey {{display_name}}, we got a request to reset your OddWons password. No worries - it happens to the best of us!
         </p>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             Click the button below to set a new password:
         </p>
 
-        {button("Reset Password", reset_url)}
+        {button("Reset Password", "{reset_url}")}
 
         {info_box("This link expires in 1 hour for security reasons.")}
 
@@ -257,6 +362,14 @@ async def send_password_reset_email(to_email: str, reset_token: str, name: str =
         </p>
     """
 
+
+async def send_password_reset_email(to_email: str, reset_token: str, name: str = None) -> bool:
+    """Password reset request email."""
+    display_name = escape(name or "there")
+    reset_url = f"https://oddwons.ai/reset-password?token={reset_token}"
+
+    content = _PASSWORD_RESET_CONTENT.format(display_name=display_name, reset_url=reset_url)
+
     return await send_email(
         to_email=to_email,
         subject="Reset your OddWons password",
@@ -264,16 +377,12 @@ async def send_password_reset_email(to_email: str, reset_token: str, name: str =
     )
 
 
-async def send_password_changed_email(to_email: str, name: str = None) -> bool:
-    """Confirmation that password was changed."""
-    display_name = name or "there"
-
-    content = f"""
+_PASSWORD_CHANGED_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             Password changed successfully
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, just confirming that your OddWons password was just changed.
+            Hey {{display_name}}, just confirming that your OddWons password was just changed.
         </p>
 
         {info_box("If you didn't make this change, please contact us immediately by replying to this email.")}
@@ -281,6 +390,13 @@ async def send_password_changed_email(to_email: str, name: str = None) -> bool:
         {button("Go to OddWons", "https://oddwons.ai")}
     """
 
+
+async def send_password_changed_email(to_email: str, name: str = None) -> bool:
+    """Confirmation that password was changed."""
+    display_name = escape(name or "there")
+
+    content = _PASSWORD_CHANGED_CONTENT.format(display_name=display_name)
+
     return await send_email(
         to_email=to_email,
         subject="Your OddWons password was changed",
@@ -292,16 +408,12 @@ async def send_password_changed_email(to_email: str, name: str = None) -> bool:
 # SUBSCRIPTION EMAILS
 # -----------------------------------------------------------------------------
 
-async def send_trial_started_email(to_email: str, name: str = None, tier: str = "BASIC") -> bool:
-    """Trial period started."""
-    display_name = name or to_email.split('@')[0]
-
-    content = f"""
+_TRIAL_STARTED_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             Your free trial is active!
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 8px 0;">
-            Hey {display_name}, you've got <strong>7 days</strong> to explore OddWons {tier_badge(tier)} features.
+            Hey {{display_name}}, you've got <strong>7 days</strong> to explore OddWons {{tier_badge}} features.
         </p>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             No credit card charged until your trial ends. Cancel anytime.
@@ -323,6 +435,13 @@ async def send_trial_started_email(to_email: str, name: str = None, tier: str =
         </p>
     """
 
+
+async def send_trial_started_email(to_email: str, name: str = None, tier: str = "BASIC") -> bool:
+    """Trial period started."""
+    display_name = escape(name or to_email.split('@')[0])
+
+    content = _TRIAL_STARTED_CONTENT.format(display_name=display_name, tier_badge=tier_badge(tier))
+
     return await send_email(
         to_email=to_email,
         subject=f"Your {tier} trial is now active - 7 days free!",
@@ -330,17 +449,12 @@ async def send_trial_started_email(to_email: str, name: str = None, tier: str =
     )
 
 
-async def send_trial_ending_soon_email(to_email: str, days_left: int, name: str = None, tier: str = "BASIC") -> bool:
-    """Trial ending reminder (3 days or 1 day)."""
-    display_name = name or "there"
-    urgency = "tomorrow" if days_left == 1 else f"in {days_left} days"
-
-    content = f"""
+_TRIAL_ENDING_SOON_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
-            Your trial ends {urgency}
+            Your trial ends {{urgency}}
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, just a heads up - your OddWons {tier_badge(tier)} trial wraps up {urgency}.
+            Hey {{display_name}}, just a heads up - your OddWons {{tier_badge}} trial wraps up {{urgency}}.
         </p>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             To keep your access to AI insights and market analysis, upgrade to a paid plan:
@@ -380,6 +494,14 @@ async def send_trial_ending_soon_email(to_email: str, days_left: int, name: str
         </p>
     """
 
+
+async def send_trial_ending_soon_email(to_email: str, days_left: int, name: str = None, tier: str = "BASIC") -> bool:
+    """Trial ending reminder (3 days or 1 day)."""
+    display_name = escape(name or "there")
+    urgency = "tomorrow" if days_left == 1 else f"in {days_left} days"
+
+    content = _TRIAL_ENDING_SOON_CONTENT.format(display_name=display_name, urgency=urgency, tier_badge=tier_badge(tier))
+
     return await send_email(
         to_email=to_email,
         subject=f"Your OddWons trial ends {urgency}",
@@ -387,16 +509,12 @@ async def send_trial_ending_soon_email(to_email: str, days_left: int, name: str
     )
 
 
-async def send_trial_ended_email(to_email: str, name: str = None) -> bool:
-    """Trial has ended."""
-    display_name = name or "there"
-
-    content = f"""
+_TRIAL_ENDED_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             Your trial has ended
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, your 7-day OddWons trial is now over.
+            Hey {{display_name}}, your 7-day OddWons trial is now over.
         </p>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             You've been downgraded to the free tier, which means limited access to insights and features.
@@ -420,6 +538,13 @@ async def send_trial_ended_email(to_email: str, name: str = None) -> bool:
         </p>
     """
 
+
+async def send_trial_ended_email(to_email: str, name: str = None) -> bool:
+    """Trial has ended."""
+    display_name = escape(name or "there")
+
+    content = _TRIAL_ENDED_CONTENT.format(display_name=display_name)
+
     return await send_email(
         to_email=to_email,
         subject="Your OddWons trial has ended - we miss you already!",
@@ -427,46 +552,44 @@ async def send_trial_ended_email(to_email: str, name: str = None) -> bool:
     )
 
 
-async def send_subscription_confirmed_email(to_email: str, tier: str, amount: float, name: str = None) -> bool:
-    """Subscription payment confirmed."""
-    display_name = name or "there"
-
-    tier_features = {
-        "BASIC": [
-            "Daily AI market highlights",
-            "Top 10 market insights",
-            "Email notifications",
-            "Basic market alerts",
-        ],
-        "PREMIUM": [
-            "Everything in Basic",
-            "Real-time alerts",
-            "Cross-platform comparison",
-            "SMS notifications",
-            "Movement analysis",
-        ],
-        "PRO": [
-            "Everything in Premium",
-            "API access",
-            "Advanced pattern detection",
-            "Priority support",
-            "Early feature access",
-        ],
-    }
-
-    features = tier_features.get(tier.upper(), tier_features["BASIC"])
-
-    content = f"""
+_TIER_FEATURES = {
+    "BASIC": [
+        "Daily AI market highlights",
+        "Top 10 market insights",
+        "Email notifications",
+        "Basic market alerts",
+    ],
+    "PREMIUM": [
+        "Everything in Basic",
+        "Real-time alerts",
+        "Cross-platform comparison",
+        "SMS notifications",
+        "Movement analysis",
+    ],
+    "PRO": [
+        "Everything in Premium",
+        "API access",
+        "Advanced pattern detection",
+        "Priority support",
+        "Early feature access",
+    ],
+}
+
+# Feature list HTML per tier, rendered once at import
+_TIER_FEATURES_HTML = {tier: feature_list(features) for tier, features in _TIER_FEATURES.items()}
+
+
+_SUBSCRIPTION_CONFIRMED_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
-            You're officially {tier_badge(tier)}!
+            You're officially {{tier_badge}}!
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, welcome to OddWons {tier}! Your payment of <strong>${amount:.2f}</strong> was successful.
+            Hey {{display_name}}, welcome to OddWons {{tier}}! Your payment of <strong>${{amount:.2f}}</strong> was successful.
         </p>
 
         <p style="color: #111827; font-weight: 600; margin: 24px 0 12px 0;">Here's what you now have access to:</p>
 
-        {feature_list(features)}
+        {{features}}
 
         {button("Go to Dashboard", "https://oddwons.ai/dashboard")}
 
@@ -477,6 +600,15 @@ async def send_subscription_confirmed_email(to_email: str, tier: str, amount: fl
         </p>
     """
 
+
+async def send_subscription_confirmed_email(to_email: str, tier: str, amount: float, name: str = None) -> bool:
+    """Subscription payment confirmed."""
+    display_name = escape(name or "there")
+
+    features_html = _TIER_FEATURES_HTML.get(tier.upper(), _TIER_FEATURES_HTML["BASIC"])
+
+    content = _SUBSCRIPTION_CONFIRMED_CONTENT.format(display_name=display_name, tier=tier, amount=amount, tier_badge=tier_badge(tier), features=features_html)
+
     return await send_email(
         to_email=to_email,
         subject=f"You're now OddWons {tier}!",
@@ -484,19 +616,15 @@ async def send_subscription_confirmed_email(to_email: str, tier: str, amount: fl
     )
 
 
-async def send_subscription_cancelled_email(to_email: str, tier: str, end_date: str, name: str = None) -> bool:
-    """Subscription cancelled."""
-    display_name = name or "there"
-
-    content = f"""
+_SUBSCRIPTION_CANCELLED_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             We're sad to see you go
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, your {tier_badge(tier)} subscription has been cancelled.
+            Hey {{display_name}}, your {{tier_badge}} subscription has been cancelled.
         </p>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            You'll still have access to your current features until <strong>{end_date}</strong>, then you'll be moved to the free tier.
+            You'll still have access to your current features until <strong>{{end_date}}</strong>, then you'll be moved to the free tier.
         </p>
 
         {info_box("Changed your mind? You can resubscribe anytime before your access ends.")}
@@ -508,6 +636,13 @@ async def send_subscription_cancelled_email(to_email: str, tier: str, end_date:
         </p>
     """
 
+
+async def send_subscription_cancelled_email(to_email: str, tier: str, end_date: str, name: str = None) -> bool:
+    """Subscription cancelled."""
+    display_name = escape(name or "there")
+
+    content = _SUBSCRIPTION_CANCELLED_CONTENT.format(display_name=display_name, end_date=end_date, tier_badge=tier_badge(tier))
+
     return await send_email(
         to_email=to_email,
         subject="Your OddWons subscription has been cancelled",
@@ -515,16 +650,12 @@ async def send_subscription_cancelled_email(to_email: str, tier: str, end_date:
     )
 
 
-async def send_payment_failed_email(to_email: str, amount: float, name: str = None) -> bool:
-    """Payment failed notification."""
-    display_name = name or "there"
-
-    content = f"""
+_PAYMENT_FAILED_CONTENT = f"""
         <h2 style="color: {BRAND_ERROR}; margin: 0 0 16px 0; font-size: 24px;">
             Payment failed
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
-            Hey {display_name}, we couldn't process your payment of <strong>${amount:.2f}</strong>.
+            Hey {{display_name}}, we couldn't process your payment of <strong>${{amount:.2f}}</strong>.
         </p>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             This could happen if your card expired, has insufficient funds, or was declined by your bank.
@@ -539,6 +670,13 @@ async def send_payment_failed_email(to_email: str, amount: float, name: str = No
         </p>
     """
 
+
+async def send_payment_failed_email(to_email: str, amount: float, name: str = None) -> bool:
+    """Payment failed notification."""
+    display_name = escape(name or "there")
+
+    content = _PAYMENT_FAILED_CONTENT.format(display_name=display_name, amount=amount)
+
     return await send_email(
         to_email=to_email,
         subject="Your OddWons payment failed",
@@ -546,18 +684,7 @@ async def send_payment_failed_email(to_email: str, amount: float, name: str = No
     )
 
 
-async def send_payment_receipt_email(
-    to_email: str,
-    amount: float,
-    tier: str,
-    invoice_id: str,
-    name: str = None
-) -> bool:
-    """Payment receipt/invoice."""
-    display_name = name or "there"
-    date = datetime.now().strftime("%B %d, %Y")
-
-    content = f"""
+_PAYMENT_RECEIPT_CONTENT = """
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             Payment received
         </h2>
@@ -581,7 +708,7 @@ async def send_payment_receipt_email(
             <tr>
                 <td style="padding: 12px 20px; border-bottom: 1px solid #e5e7eb;">
                     <span style="color: #6b7280;">Plan</span>
-                    <span style="float: right;">{tier_badge(tier)}</span>
+                    <span style="float: right;">{tier_badge}</span>
                 </td>
             </tr>
             <tr>
@@ -597,6 +724,27 @@ async def send_payment_receipt_email(
         </p>
     """
 
+
+async def send_payment_receipt_email(
+    to_email: str,
+    amount: float,
+    tier: str,
+    invoice_id: str,
+    name: str = None
+) -> bool:
+    """Payment receipt/invoice."""
+    display_name = escape(name or "there")
+    today = _today("%B %d, %Y")
+
+    content = _PAYMENT_RECEIPT_CONTENT.format(
+        display_name=display_name,
+        invoice_id=escape(invoice_id),
+        date=today,
+        amount=amount,
+        to_email=escape(to_email),
+        tier_badge=tier_badge(tier),
+    )
+
     return await send_email(
         to_email=to_email,
         subject=f"Receipt for your OddWons {tier} subscription",
@@ -608,49 +756,37 @@ async def send_payment_receipt_email(
 # PRODUCT/ALERT EMAILS
 # -----------------------------------------------------------------------------
 
-async def send_market_alert_email(
-    to_email: str,
-    market_title: str,
-    alert_type: str,
-    old_price: float,
-    new_price: float,
-    platform: str,
-    name: str = None
-) -> bool:
-    """Market price movement alert."""
-    display_name = name or "there"
-
-    price_change = new_price - old_price
-    direction = "up" if price_change > 0 else "down"
-    direction_color = BRAND_SUCCESS if price_change > 0 else BRAND_ERROR
-
-    content = f"""
+# Market alerts are split around the greeting: the details below it are the same
+# for every recipient of an alert and are rendered once, the greeting per send
+_MARKET_ALERT_GREETING = """
         <h2 style="color: #111827; margin: 0 0 16px 0; font-size: 24px;">
             Market Alert
         </h2>
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
             Hey {display_name}, a market you're watching just moved!
         </p>
+"""
 
+_MARKET_ALERT_DETAILS = f"""
         <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="background-color: #f9fafb; border-radius: 12px; overflow: hidden; margin: 0 0 24px 0;">
             <tr>
                 <td style="padding: 20px;">
-                    <p style="margin: 0 0 8px 0; color: #6b7280; font-size: 12px; text-transform: uppercase;">{platform}</p>
-                    <h3 style="margin: 0 0 16px 0; color: #111827; font-size: 18px;">{market_title}</h3>
+                    <p style="margin: 0 0 8px 0; color: #6b7280; font-size: 12px; text-transform: uppercase;">{{platform}}</p>
+                    <h3 style="margin: 0 0 16px 0; color: #111827; font-size: 18px;">{{market_title}}</h3>
 
                     <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
                         <tr>
                             <td style="text-align: center; padding: 12px;">
                                 <p style="margin: 0; color: #6b7280; font-size: 12px;">Was</p>
-                                <p style="margin: 4px 0 0 0; color: #111827; font-size: 24px; font-weight: 700;">{old_price:.0%}</p>
+                                <p style="margin: 4px 0 0 0; color: #111827; font-size: 24px; font-weight: 700;">{{old_price:.0%}}</p>
                             </td>
                             <td style="text-align: center; padding: 12px;">
                                 <p style="margin: 0; color: #6b7280; font-size: 12px;">Now</p>
-                                <p style="margin: 4px 0 0 0; color: {direction_color}; font-size: 24px; font-weight: 700;">{new_price:.0%}</p>
+                                <p style="margin: 4px 0 0 0; color: {{direction_color}}; font-size: 24px; font-weight: 700;">{{new_price:.0%}}</p>
                             </td>
                             <td style="text-align: center; padding: 12px;">
                                 <p style="margin: 0; color: #6b7280; font-size: 12px;">Change</p>
-                                <p style="margin: 4px 0 0 0; color: {direction_color}; font-size: 24px; font-weight: 700;">{'+' if price_change > 0 else ''}{price_change:.0%}</p>
+                                <p style="margin: 4px 0 0 0; color: {{direction_color}}; font-size: 24px; font-weight: 700;">{{sign}}{{price_change:.0%}}</p>
                             </td>
                         </tr>
                     </table>
@@ -665,65 +801,77 @@ async def send_market_alert_email(
         </p>
     """
 
-    return await send_email(
-        to_email=to_email,
-        subject=f"{market_title} moved {direction} {abs(price_change):.0%}",
-        html_content=get_base_template(content, f"Market alert: {market_title} is now at {new_price:.0%}")
+
+@lru_cache(maxsize=256)
+def _render_market_alert(
+    platform: str,
+    market_title: str,
+    old_price: float,
+    new_price: float,
+) -> str:
+    """Render a market alert's details; batches repeat the same alert to many users."""
+    price_change = new_price - old_price
+    return _MARKET_ALERT_DETAILS.format(
+        platform=escape(platform),
+        market_title=escape(market_title),
+        old_price=old_price,
+        new_price=new_price,
+        price_change=price_change,
+        sign="+" if price_change > 0 else "",
+        direction_color=BRAND_SUCCESS if price_change > 0 else BRAND_ERROR,
     )
 
 
-async def send_daily_digest_email(
+async def send_market_alert_email(
     to_email: str,
-    insights: List[Dict[str, Any]],
-    stats: Dict[str, Any],
+    market_title: str,
+    alert_type: str,
+    old_price: float,
+    new_price: float,
+    platform: str,
     name: str = None
 ) -> bool:
-    """Daily digest with top AI insights."""
-    display_name = name or "there"
-    date = datetime.now().strftime("%A, %B %d")
-
-    # Build insights HTML
-    insights_html = ""
-    for i, insight in enumerate(insights[:5], 1):
-        title = insight.get("market_title", "Market")
-        summary = insight.get("summary", "")
-        price = insight.get("yes_price", 0)
-        platform = insight.get("platform", "")
-
-        insights_html += f"""
-        <tr>
-            <td style="padding: 16px 0; border-bottom: 1px solid #e5e7eb;">
-                <p style="margin: 0 0 4px 0; color: #6b7280; font-size: 12px; text-transform: uppercase;">{platform}</p>
-                <h4 style="margin: 0 0 8px 0; color: #111827; font-size: 16px;">{title}</h4>
-                <p style="margin: 0 0 8px 0; color: #4b5563; font-size: 14px; line-height: 1.5;">{summary[:150]}...</p>
-                <span style="display: inline-block; background-color: {BRAND_LIGHT}; color: {BRAND_DARK}; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: 600;">Yes: {price:.0%}</span>
-            </td>
-        </tr>
-        """
+    """Market price movement alert."""
+    display_name = escape(name or "there")
+
+    price_change = new_price - old_price
+    direction = "up" if price_change > 0 else "down"
+
+    content = (
+        _MARKET_ALERT_GREETING.format(display_name=display_name)
+        + _render_market_alert(platform, market_title, old_price, new_price)
+    )
+
+    return await send_email(
+        to_email=to_email,
+        subject=f"{market_title} moved {direction} {abs(price_change):.0%}",
+        html_content=get_base_template(content, f"Market alert: {escape(market_title)} is now at {new_price:.0%}")
+    )
 
-    content = f"""
+
+_DAILY_DIGEST_CONTENT = f"""
         <h2 style="color: #111827; margin: 0 0 8px 0; font-size: 24px;">
             Your Daily Digest
         </h2>
-        <p style="color: #6b7280; margin: 0 0 24px 0; font-size: 14px;">{date}</p>
+        <p style="color: #6b7280; margin: 0 0 24px 0; font-size: 14px;">{{date}}</p>
 
         <p style="color: #4b5563; font-size: 16px; line-height: 1.6; margin: 0 0 24px 0;">
-            Hey {display_name}, here's what's happening in prediction markets today:
+            Hey {{display_name}}, here's what's happening in prediction markets today:
         </p>
 
         <!-- Stats bar -->
         <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="background-color: {BRAND_LIGHT}; border-radius: 12px; margin: 0 0 24px 0;">
             <tr>
                 <td style="padding: 16px; text-align: center; border-right: 1px solid {BRAND_PRIMARY}20;">
-                    <p style="margin: 0; color: {BRAND_DARK}; font-size: 24px; font-weight: 700;">{stats.get('total_markets', 0):,}</p>
+                    <p style="margin: 0; color: {BRAND_DARK}; font-size: 24px; font-weight: 700;">{{total_markets:,}}</p>
                     <p style="margin: 4px 0 0 0; color: #6b7280; font-size: 12px;">Markets</p>
                 </td>
                 <td style="padding: 16px; text-align: center; border-right: 1px solid {BRAND_PRIMARY}20;">
-                    <p style="margin: 0; color: {BRAND_DARK}; font-size: 24px; font-weight: 700;">{stats.get('movers', 0)}</p>
+                    <p style="margin: 0; color: {BRAND_DARK}; font-size: 24px; font-weight: 700;">{{movers}}</p>
                     <p style="margin: 4px 0 0 0; color: #6b7280; font-size: 12px;">Big Movers</p>
                 </td>
                 <td style="padding: 16px; text-align: center;">
-                    <p style="margin: 0; color: {BRAND_DARK}; font-size: 24px; font-weight: 700;">${stats.get('volume', 0)/1e9:.1f}B</p>
+                    <p style="margin: 0; color: {BRAND_DARK}; font-size: 24px; font-weight: 700;">${{volume_billions:.1f}}B</p>
                     <p style="margin: 4px 0 0 0; color: #6b7280; font-size: 12px;">Volume</p>
                 </td>
             </tr>
@@ -732,7 +880,7 @@ async def send_daily_digest_email(
         <h3 style="color: #111827; margin: 0 0 16px 0; font-size: 18px;">Today's Top Insights</h3>
 
         <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
-            {insights_html}
+            {{insights_html}}
         </table>
 
         {button("See All Insights", "https://oddwons.ai/opportunities")}
@@ -742,24 +890,107 @@ async def send_daily_digest_email(
         </p>
     """
 
-    return await send_email(
-        to_email=to_email,
-        subject=f"Your OddWons Daily Digest - {date}",
-        html_content=get_base_template(content, f"Your daily prediction market insights for {date}")
+
+_DIGEST_INSIGHT_ROW = f"""
+        <tr>
+            <td style="padding: 16px 0; border-bottom: 1px solid #e5e7eb;">
+                <p style="margin: 0 0 4px 0; color: #6b7280; font-size: 12px; text-transform: uppercase;">{{platform}}</p>
+                <h4 style="margin: 0 0 8px 0; color: #111827; font-size: 16px;">{{title}}</h4>
+                <p style="margin: 0 0 8px 0; color: #4b5563; font-size: 14px; line-height: 1.5;">{{summary}}</p>
+                <span style="display: inline-block; background-color: {BRAND_LIGHT}; color: {BRAND_DARK}; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: 600;">Yes: {{price:.0%}}</span>
+            </td>
+        </tr>
+        """
+
+
+def _truncate(text: str, length: int) -> str:
+    """Shorten text to length characters, adding an ellipsis only if it was cut."""
+    return text if len(text) <= length else text[:length] + "…"
+
+
+class _Insight(NamedTuple):
+    """Digest insight fields, normalized once from the raw insight dict."""
+    platform: str
+    title: str
+    summary: str
+    price: float
+
+
+def _normalize_insights(insights: List[Dict[str, Any]]) -> Tuple[_Insight, ...]:
+    """Top 5 insights as hashable records (also the digest render cache key)."""
+    return tuple(
+        _Insight(
+            insight.get("platform", ""),
+            insight.get("market_title", "Market"),
+            insight.get("summary", ""),
+            insight.get("yes_price", 0),
+        )
+        for insight in insights[:5]
+    )
+
+
+@lru_cache(maxsize=32)
+def _render_digest_insights(insights: Tuple[_Insight, ...]) -> str:
+    """Render the digest insight rows."""
+    return "".join([
+        _DIGEST_INSIGHT_ROW.format(
+            platform=escape(ins.platform),
+            title=escape(ins.title),
+            summary=escape(_truncate(ins.summary, DIGEST_SUMMARY_LENGTH)),
+            price=ins.price,
+        )
+        for ins in insights
+    ])
+
+
+def _build_daily_digest(
+    insights: List[Dict[str, Any]],
+    stats: Dict[str, Any],
+    display_name: str
+) -> Tuple[str, str]:
+    """Build the daily digest subject and HTML."""
+    today = _today("%A, %B %d")
+
+    # The insight rows are the same for every recipient of a day's digest
+    insights_html = _render_digest_insights(_normalize_insights(insights))
+
+    content = _DAILY_DIGEST_CONTENT.format(
+        display_name=display_name,
+        date=today,
+        total_markets=stats.get('total_markets', 0),
+        movers=stats.get('movers', 0),
+        volume_billions=stats.get('volume', 0) / 1e9,
+        insights_html=insights_html,
+    )
+
+    return (
+        f"Your OddWons Daily Digest - {today}",
+        get_base_template(content, f"Your daily prediction market insights for {today}"),
     )
 
 
+async def send_daily_digest_email(
+    to_email: str,
+    insights: List[Dict[str, Any]],
+    stats: Dict[str, Any],
+    name: str = None
+) -> bool:
+    """Daily digest with top AI insights."""
+    subject, html_content = _build_daily_digest(insights, stats, escape(name or "there"))
+    return await send_email(to_email=to_email, subject=subject, html_content=html_content)
+
+
 # -----------------------------------------------------------------------------
 # BATCH ALERT PROCESSING
 # -----------------------------------------------------------------------------
 
 async def process_pending_alert_emails() -> dict:
     """
-    Process all unsent alert emails.
+    Process unsent alert emails, up to ALERT_EMAIL_BATCH_SIZE per run.
     Called at the end of each 15-min collection/analysis cycle.
     Returns count of emails sent.
     """
-    from sqlalchemy import select, and_
+    from sqlalchemy import select, update, and_
     from app.core.database import AsyncSessionLocal
     from app.models.market import Alert
     from app.models.user import User
@@ -767,43 +998,76 @@ async def process_pending_alert_emails() -> dict:
     results = {"processed": 0, "sent": 0, "failed": 0}
 
     async with AsyncSessionLocal() as session:
-        # Get all unsent alerts with user info
+        # Claim unsent alerts with user info. The row locks are held until
+        # commit, so a concurrent run skips these alerts instead of re-sending.
         query = select(Alert, User).join(User, Alert.user_id == User.id).where(
             and_(
                 Alert.email_sent == False,
                 User.email_alerts_enabled == True
             )
-        ).order_by(Alert.created_at.desc()).limit(100)
-
-        result = await session.execute(query)
-        alerts_with_users = result.all()
-
-        for alert, user in alerts_with_users:
-            results["processed"] += 1
+        ).order_by(Alert.created_at.desc()).limit(ALERT_EMAIL_BATCH_SIZE).with_for_update(
+            of=Alert, skip_locked=True
+        )
 
-            try:
-                success = await send_market_alert_email(
-                    to_email=user.email,
-                    market_title=alert.title,
-                    alert_type=alert.alert_type,
-                    old_price=alert.old_price or 0,
-                    new_price=alert.new_price or 0,
-                    platform=alert.platform or "unknown",
-                    name=user.name
-                )
+        # Stream rows into a bounded queue drained by a fixed pool of senders
+        queue: asyncio.Queue = asyncio.Queue(maxsize=ALERT_EMAIL_CONCURRENCY * 2)
+        sent_ids = []
+
+        async def sender():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                alert, user = item
+                results["processed"] += 1
+
+                try:
+                    success = await send_market_alert_email(
+                        to_email=user.email,
+                        market_title=alert.title,
+                        alert_type=alert.alert_type,
+                        old_price=alert.old_price or 0,
+                        new_price=alert.new_price or 0,
+                        platform=alert.platform or "unknown",
+                        name=user.name
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to send alert email for alert {alert.id}: {e}")
+                    results["failed"] += 1
+                    continue
 
                 if success:
-                    alert.email_sent = True
-                    alert.email_sent_at = datetime.utcnow()
+                    sent_ids.append(alert.id)
                     results["sent"] += 1
                 else:
                     results["failed"] += 1
 
-            except Exception as e:
-                logger.error(f"Failed to send alert email for alert {alert.id}: {e}")
-                results["failed"] += 1
-
+        senders = [asyncio.create_task(sender()) for _ in range(ALERT_EMAIL_CONCURRENCY)]
+        stream_error = None
+        try:
+            stream = await session.stream(query)
+            async for alert, user in stream:
+                await queue.put((alert, user))
+        except Exception as e:
+            stream_error = e
+        finally:
+            for _ in senders:
+                await queue.put(None)
+            await asyncio.gather(*senders)
+
+        if stream_error is not None:
+            # Still record what was delivered before the read failed
+            logger.error(f"Failed reading pending alerts: {stream_error}")
+            await session.rollback()
+
+        # Mark the whole batch sent with one UPDATE
+        if sent_ids:
+            await session.execute(
+                update(Alert)
+                .where(Alert.id.in_(sent_ids))
+                .values(email_sent=True, email_sent_at=datetime.utcnow())
+            )
         await session.commit()
 
-    logger.info(f"Alert email batch complete: {results}")
+    logger.info("Alert email batch complete: %s", results)
     return results
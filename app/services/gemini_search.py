@@ -5,12 +5,41 @@ Uses Gemini 2.0 Flash with Google Search grounding to fetch real news context.
 Cost: FREE for first 1,500 searches/day
 """
 import os
+import re
+import copy
 import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
+
+try:
+    # orjson is a much faster parser; its JSONDecodeError subclasses json's
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence the model sometimes wraps its JSON in
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+# Category searches in flight at once (keeps bursts well inside the free quota)
+MAX_CONCURRENT_SEARCHES = 4
+
+# How long a category's news is reused before searching again (seconds)
+NEWS_CACHE_TTL = 1800
+NEWS_CACHE_MAX_ENTRIES = 256
+
+# (client, types) once a Gemini client has been built; reused by every search
+_client: Optional[Tuple[Any, Any]] = None
+
+# (category, market titles hash) -> (fetched at, result); errors are never cached
+_news_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+# Searches in progress, so concurrent callers for the same key share one request
+_news_in_flight: Dict[Tuple[str, str], "asyncio.Task[Dict[str, Any]]"] = {}
+
 
 def _get_api_key() -> Optional[str]:
     """Get Gemini API key from environment or keys.txt."""
@@ -33,7 +62,11 @@ def _get_api_key() -> Optional[str]:
 
 
 def _get_client():
-    """Get configured Gemini client."""
+    """Get configured Gemini client, building it on first successful use."""
+    global _client
+    if _client is not None:
+        return _client
+
     try:
         from google import genai
         from google.genai import types
@@ -43,16 +76,48 @@ def _get_client():
             logger.warning("GEMINI_API_KEY not found")
             return None, None
 
-        client = genai.Client(api_key=api_key)
-        return client, types
+        _client = (genai.Client(api_key=api_key), types)
+        return _client
     except ImportError:
         logger.error("google-genai not installed. Run: pip install google-genai")
         return None, None
 
 
+def _strip_fence(text: str) -> str:
+    """Extract the JSON body from a possibly fenced model response."""
+    match = _FENCE_RE.search(text)
+    return match.group(1).strip() if match else text.strip()
+
+
+def _news_cache_key(category: str, market_titles: List[str]) -> Tuple[str, str]:
+    titles = "|".join(sorted(market_titles[:5]))
+    return category, hashlib.blake2b(titles.encode(), digest_size=8).hexdigest()
+
+
+def _store_news(key: Tuple[str, str], result: Dict[str, Any]) -> None:
+    now = time.monotonic()
+    if len(_news_cache) >= NEWS_CACHE_MAX_ENTRIES:
+        for stale in [k for k, (at, _) in _news_cache.items() if now - at >= NEWS_CACHE_TTL]:
+            del _news_cache[stale]
+        if len(_news_cache) >= NEWS_CACHE_MAX_ENTRIES:
+            del _news_cache[next(iter(_news_cache))]
+    _news_cache[key] = (now, result)
+
+
+def _finish_news_search(key: Tuple[str, str], task: "asyncio.Task[Dict[str, Any]]") -> None:
+    """Done callback of a search task: cache a successful result once, for every awaiter."""
+    _news_in_flight.pop(key, None)
+    if not task.cancelled() and task.exception() is None:
+        result = task.result()
+        if "error" not in result:
+            _store_news(key, result)
+
+
 async def search_category_news(category: str, market_titles: List[str]) -> Dict[str, Any]:
     """
-    Search for recent news related to a market category using Gemini with Google Search.
+    Search for recent news related to a market category, reusing results for NEWS_CACHE_TTL.
+
+    Each caller gets its own copy, so mutating the result never changes the cached one.
 
     Args:
         category: Category name (politics, sports, crypto, etc.)
@@ -61,6 +126,22 @@ async def search_category_news(category: str, market_titles: List[str]) -> Dict[
     Returns:
         Dict with headlines, key events, and context
     """
+    key = _news_cache_key(category, market_titles)
+    cached = _news_cache.get(key)
+    if cached and time.monotonic() - cached[0] < NEWS_CACHE_TTL:
+        return copy.deepcopy(cached[1])
+
+    task = _news_in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_category_news(category, market_titles))
+        _news_in_flight[key] = task
+        task.add_done_callback(lambda t: _finish_news_search(key, t))
+
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+async def _fetch_category_news(category: str, market_titles: List[str]) -> Dict[str, Any]:
+    """Search for a category's recent news using Gemini with Google Search (uncached)."""
     client, types = _get_client()
     if not client:
         return {
@@ -93,7 +174,7 @@ Be concise. Focus on facts that would move prediction market prices. Return vali
 
     try:
         # Use Gemini 2.0 Flash with Google Search grounding
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -103,20 +184,14 @@ Be concise. Focus on facts that would move prediction market prices. Return vali
         )
 
         # Parse response - handle both raw JSON and markdown-wrapped JSON
-        text = response.text.strip()
-
-        # Try to extract JSON from response
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0].strip()
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0].strip()
+        text = _strip_fence(response.text)
 
-        result = json.loads(text)
-        logger.info(f"Gemini search for {category}: {len(result.get('headlines', []))} headlines")
+        result = json_loads(text)
+        logger.info("Gemini search for %s: %d headlines", category, len(result.get('headlines', [])))
         return result
 
     except json.JSONDecodeError as e:
-        logger.error(f"Gemini response not valid JSON for {category}: {e}")
+        logger.error("Gemini response not valid JSON for %s: %s", category, e)
         # Return raw text in error for debugging
         return {
             "error": f"Invalid JSON response: {str(e)}",
@@ -125,7 +200,7 @@ Be concise. Focus on facts that would move prediction market prices. Return vali
             "category_summary": f"Unable to parse {category} news response"
         }
     except Exception as e:
-        logger.error(f"Gemini search failed for {category}: {e}")
+        logger.error("Gemini search failed for %s: %s", category, e)
         return {
             "error": str(e),
             "headlines": [],
@@ -155,7 +230,7 @@ Return JSON:
 Be concise and factual. Return valid JSON only."""
 
     try:
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -164,16 +239,12 @@ Be concise and factual. Return valid JSON only."""
             )
         )
 
-        text = response.text.strip()
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0].strip()
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0].strip()
+        text = _strip_fence(response.text)
 
-        return json.loads(text)
+        return json_loads(text)
 
     except Exception as e:
-        logger.error(f"Gemini market search failed: {e}")
+        logger.error("Gemini market search failed: %s", e)
         return {"error": str(e)}
 
 
@@ -189,13 +260,30 @@ async def batch_search_categories(
     Returns:
         Dict mapping category -> news context
     """
-    results = {}
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+    async def search_one(category: str, market_titles: List[str]) -> Dict[str, Any]:
+        async with semaphore:
+            logger.info("Fetching news context for %s (%d markets)...", category, len(market_titles))
+            return await search_category_news(category, market_titles)
 
-    for category, market_titles in categories_with_markets.items():
-        if not market_titles:
-            continue
+    categories = [(c, t) for c, t in categories_with_markets.items() if t]
+    outcomes = await asyncio.gather(
+        *(search_one(category, titles) for category, titles in categories),
+        return_exceptions=True,
+    )
 
-        logger.info(f"Fetching news context for {category} ({len(market_titles)} markets)...")
-        results[category] = await search_category_news(category, market_titles)
+    results = {}
+    for (category, _), outcome in zip(categories, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Gemini search failed for %s: %s", category, outcome)
+            results[category] = {
+                "error": str(outcome),
+                "headlines": [],
+                "key_events": [],
+                "category_summary": f"Unable to fetch recent {category} news"
+            }
+        else:
+            results[category] = outcome
 
     return results
@@ -1,15 +1,124 @@
+import json
+import time
 import httpx
 import asyncio
-from typing import Optional, List, Dict, Any
+import random
+import operator
+from functools import lru_cache, wraps
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
 from app.config import get_settings
 from app.schemas.market import KalshiMarketData
 
+try:
+    # orjson parses response bytes directly and is much faster than the stdlib
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Request pacing: steady requests/second and burst size for the token bucket.
+# The rate halves on every 429 and climbs back by RATE_RECOVERY_STEP per success.
+REQUEST_RATE = 20.0
+REQUEST_BURST = 20
+MIN_REQUEST_RATE = 2.0
+RATE_RECOVERY_STEP = 0.5
+
+# Event detail fetches in flight at once; paces requests under Kalshi's rate limit
+EVENT_FETCH_CONCURRENCY = 8
+# Connection pool sized for concurrent event fetches over one shared client
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30)
+# Pages of /events buffered ahead of processing, and tasks processing them
+EVENT_PAGE_QUEUE_SIZE = 4
+EVENT_PAGE_CONSUMERS = 4
+# Event tickers per /markets?event_ticker= request (Kalshi accepts a comma-separated list)
+EVENT_TICKER_BATCH_SIZE = 10
+# Retries for a request that gets rate limited (429), and the longest backoff between them
+RATE_LIMIT_RETRIES = 4
+MAX_RETRY_DELAY = 10.0
+
+# Fields every market row from an event query carries, read in one call
+_EVENT_MARKET_FIELDS = operator.itemgetter(
+    "ticker", "title", "yes_bid", "yes_ask", "no_bid", "no_ask",
+    "volume", "open_interest", "status", "close_time",
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_close_time(value: str) -> datetime:
+    """Parse an ISO close_time; markets in an event share them, so results are cached."""
+    return datetime.fromisoformat(value)
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait after a 429: Retry-After if given, else jittered exponential backoff.
+
+    Either way the wait is capped at MAX_RETRY_DELAY. An unparseable Retry-After
+    (e.g. an HTTP date) falls back to the backoff.
+    """
+    try:
+        delay = float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        delay = 0.0
+    if not delay > 0:
+        # Also catches a negative or NaN header value
+        delay = 0.5 * 2 ** attempt + random.random() * 0.2
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def _retry(fn):
+    """Retry a KalshiClient request method when Kalshi rate limits it."""
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                return await fn(self, *args, **kwargs)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                await asyncio.sleep(_retry_delay(e.response, attempt))
+    return wrapper
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter with additive-increase/multiplicative-decrease."""
+
+    def __init__(self, rate: float, capacity: int, min_rate: float, recovery_step: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.recovery_step = recovery_step
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def rate_limited(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+        # Refill from now, not from the last request, or the next acquire undoes the backoff
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    def succeeded(self):
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
 
 class KalshiClient:
     """Direct API client for Kalshi prediction markets."""
@@ -19,6 +128,7 @@ class KalshiClient:
         self.api_key = settings.kalshi_api_key
         self.api_secret = settings.kalshi_api_secret
         self._client: Optional[httpx.AsyncClient] = None
+        self._limiter = TokenBucket(REQUEST_RATE, REQUEST_BURST, MIN_REQUEST_RATE, RATE_RECOVERY_STEP)
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
@@ -29,14 +139,28 @@ class KalshiClient:
                 base_url=self.base_url,
                 headers=headers,
                 timeout=30.0,
+                limits=HTTP_LIMITS,
+                http2=True,
             )
         return self._client
 
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared client, paced by the token bucket."""
+        client = await self._get_client()
+        await self._limiter.acquire()
+        response = await client.get(url, **kwargs)
+        if response.status_code == 429:
+            self._limiter.rate_limited()
+        else:
+            self._limiter.succeeded()
+        return response
+
     async def close(self):
         if self._client:
             await self._client.aclose()
             self._client = None
 
+    @_retry
     async def get_markets(
         self,
         limit: int = 100,
@@ -44,7 +168,6 @@ class KalshiClient:
         status: str = "open",
     ) -> Dict[str, Any]:
         """Fetch list of markets from Kalshi."""
-        client = await self._get_client()
         params = {
             "limit": limit,
             "status": status,
@@ -53,44 +176,45 @@ class KalshiClient:
             params["cursor"] = cursor
 
         try:
-            response = await client.get("/markets", params=params)
+            response = await self._get("/markets", params=params)
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except httpx.HTTPStatusError as e:
-            logger.error(f"Kalshi API error: {e.response.status_code} - {e.response.text}")
+            logger.error("Kalshi API error: %s - %s", e.response.status_code, e.response.text)
             raise
         except Exception as e:
-            logger.error(f"Kalshi client error: {e}")
+            logger.error("Kalshi client error: %s", e)
             raise
 
+    @_retry
     async def get_market(self, ticker: str) -> Dict[str, Any]:
         """Fetch single market by ticker."""
-        client = await self._get_client()
         try:
-            response = await client.get(f"/markets/{ticker}")
+            response = await self._get(f"/markets/{ticker}")
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except httpx.HTTPStatusError as e:
-            logger.error(f"Kalshi API error for {ticker}: {e.response.status_code}")
+            logger.error("Kalshi API error for %s: %s", ticker, e.response.status_code)
             raise
         except Exception as e:
-            logger.error(f"Kalshi client error: {e}")
+            logger.error("Kalshi client error: %s", e)
             raise
 
+    @_retry
     async def get_market_orderbook(self, ticker: str) -> Dict[str, Any]:
         """Fetch orderbook for a market."""
-        client = await self._get_client()
         try:
-            response = await client.get(f"/markets/{ticker}/orderbook")
+            response = await self._get(f"/markets/{ticker}/orderbook")
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except httpx.HTTPStatusError as e:
-            logger.error(f"Kalshi orderbook error for {ticker}: {e.response.status_code}")
+            logger.error("Kalshi orderbook error for %s: %s", ticker, e.response.status_code)
             raise
         except Exception as e:
-            logger.error(f"Kalshi client error: {e}")
+            logger.error("Kalshi client error: %s", e)
             raise
 
+    @_retry
     async def get_events(
         self,
         limit: int = 100,
@@ -98,41 +222,118 @@ class KalshiClient:
         status: str = "open",
     ) -> Dict[str, Any]:
         """Fetch events (groupings of markets) - these contain the political/economic markets."""
-        client = await self._get_client()
         params = {"limit": limit, "status": status}
         if cursor:
             params["cursor"] = cursor
         try:
-            response = await client.get("/events", params=params)
+            response = await self._get("/events", params=params)
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
-            logger.error(f"Kalshi events error: {e}")
+            logger.error("Kalshi events error: %s", e)
             raise
 
+    @_retry
     async def get_event_markets(self, event_ticker: str) -> Dict[str, Any]:
         """Fetch event details including its markets."""
-        client = await self._get_client()
         try:
             # The /events/{ticker} endpoint returns {'event': {...}, 'markets': [...]}
-            response = await client.get(f"/events/{event_ticker}")
+            response = await self._get(f"/events/{event_ticker}")
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
-            logger.error(f"Kalshi event markets error for {event_ticker}: {e}")
+            logger.error("Kalshi event markets error for %s: %s", event_ticker, e)
             raise
 
     async def get_event_metadata(self, event_ticker: str) -> Dict[str, Any]:
         """Fetch event metadata including image_url."""
-        client = await self._get_client()
         try:
-            response = await client.get(f"/events/{event_ticker}/metadata")
+            response = await self._get(f"/events/{event_ticker}/metadata")
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
-            logger.warning(f"Kalshi event metadata error for {event_ticker}: {e}")
+            logger.warning("Kalshi event metadata error for %s: %s", event_ticker, e)
             return {}
 
+    async def get_markets_for_events(
+        self,
+        event_tickers: List[str],
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch raw markets for many events with batched /markets?event_ticker= queries.
+
+        Events whose batch failed are left out of the result.
+        """
+        semaphore = semaphore or asyncio.Semaphore(EVENT_FETCH_CONCURRENCY)
+        chunks = [
+            event_tickers[i:i + EVENT_TICKER_BATCH_SIZE]
+            for i in range(0, len(event_tickers), EVENT_TICKER_BATCH_SIZE)
+        ]
+        outcomes = await asyncio.gather(
+            *(self._fetch_event_chunk(chunk, semaphore) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        markets_by_event: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("Failed to fetch markets for events %s: %s", ','.join(chunk), outcome)
+                continue
+            for ticker in chunk:
+                markets_by_event[ticker] = []
+            for m in outcome:
+                markets_by_event.setdefault(m.get("event_ticker"), []).append(m)
+        return markets_by_event
+
+    @_retry
+    async def _get_markets_page(self, params: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Fetch one page of /markets, holding a semaphore slot only for the request."""
+        async with semaphore:
+            response = await self._get("/markets", params=params)
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    async def _fetch_event_chunk(
+        self,
+        event_tickers: List[str],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Dict[str, Any]]:
+        """Fetch every market for a chunk of events."""
+        params = {"event_ticker": ",".join(event_tickers), "limit": 1000}
+        markets = []
+
+        while True:
+            try:
+                result = await self._get_markets_page(params, semaphore)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 400 and len(event_tickers) > 1:
+                    # API rejected the ticker list, fall back to one request per event
+                    return await self._fetch_events_individually(event_tickers, semaphore)
+                raise
+
+            markets.extend(result.get("markets", []))
+            cursor = result.get("cursor")
+            if not cursor:
+                return markets
+            params["cursor"] = cursor
+
+    async def _fetch_events_individually(
+        self,
+        event_tickers: List[str],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Dict[str, Any]]:
+        """Fetch markets with one /events/{ticker} request per event."""
+        async def fetch_one(event_ticker: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                event_markets = await self.get_event_markets(event_ticker)
+            return [
+                {**m, "event_ticker": m.get("event_ticker") or event_ticker}
+                for m in event_markets.get("markets", [])
+            ]
+
+        results = await asyncio.gather(*(fetch_one(t) for t in event_tickers))
+        return [m for markets in results for m in markets]
+
     def parse_market(self, data: Dict[str, Any], event_image_url: Optional[str] = None, event_ticker: Optional[str] = None) -> KalshiMarketData:
         """Parse raw API response into structured data.
 
@@ -147,6 +348,9 @@ class KalshiClient:
                 return None
             return val / 100.0
 
+        def to_float(val):
+            return None if val is None else float(val)
+
         # Try to get image URL from market, event, or passed-in event_image_url
         image_url = (
             market.get("image_url") or
@@ -173,23 +377,153 @@ class KalshiClient:
 
         market_url = f"https://kalshi.com/events/{url_event}" if url_event else None
 
-        return KalshiMarketData(
+        # Every field is normalized above, so skip pydantic validation (the hot path of a scan)
+        return KalshiMarketData.model_construct(
             ticker=ticker,
-            title=market.get("title", ""),
+            title=market.get("title") or "",
             subtitle=market.get("subtitle"),
             yes_bid=cents_to_decimal(market.get("yes_bid")),
             yes_ask=cents_to_decimal(market.get("yes_ask")),
             no_bid=cents_to_decimal(market.get("no_bid")),
             no_ask=cents_to_decimal(market.get("no_ask")),
-            volume=market.get("volume"),
-            open_interest=market.get("open_interest"),
-            status=market.get("status", "unknown"),
-            close_time=datetime.fromisoformat(market["close_time"]) if market.get("close_time") else None,
+            volume=to_float(market.get("volume")),
+            open_interest=to_float(market.get("open_interest")),
+            status=market.get("status") or "unknown",
+            close_time=_parse_close_time(market["close_time"]) if market.get("close_time") else None,
             category=market.get("category"),
             image_url=image_url,
             url=market_url,
         )
 
+    def _parse_event_market(
+        self,
+        market: Dict[str, Any],
+        event_image_url: Optional[str],
+        event_ticker: str,
+        category: Optional[str],
+    ) -> KalshiMarketData:
+        """Fast path of parse_market for the flat market rows of an event query."""
+        try:
+            (
+                ticker, title, yes_bid, yes_ask, no_bid, no_ask,
+                volume, open_interest, status, close_time,
+            ) = _EVENT_MARKET_FIELDS(market)
+        except KeyError:
+            parsed = self.parse_market(market, event_image_url=event_image_url, event_ticker=event_ticker)
+            parsed.category = category
+            return parsed
+
+        return KalshiMarketData.model_construct(
+            ticker=ticker,
+            title=title or "",
+            subtitle=market.get("subtitle"),
+            yes_bid=None if yes_bid is None else yes_bid / 100.0,
+            yes_ask=None if yes_ask is None else yes_ask / 100.0,
+            no_bid=None if no_bid is None else no_bid / 100.0,
+            no_ask=None if no_ask is None else no_ask / 100.0,
+            volume=None if volume is None else float(volume),
+            open_interest=None if open_interest is None else float(open_interest),
+            status=status or "unknown",
+            close_time=_parse_close_time(close_time) if close_time else None,
+            category=category,
+            image_url=(
+                market.get("image_url") or
+                market.get("event_image_url") or
+                market.get("strike_period_image") or
+                event_image_url
+            ),
+            url=f"https://kalshi.com/events/{event_ticker}",
+        )
+
+    def _parse_batch(
+        self,
+        raw_batch: List[Tuple[Dict[str, Any], Optional[str], Optional[str], Optional[Dict[str, Any]]]],
+    ) -> List[KalshiMarketData]:
+        """Parse (market, event_image_url, event_ticker, event) rows, skipping bad ones."""
+        parsed_markets = []
+        for market, event_image_url, event_ticker, event in raw_batch:
+            try:
+                if event is not None:
+                    # Add category from event
+                    parsed = self._parse_event_market(market, event_image_url, event_ticker, event.get("category"))
+                else:
+                    parsed = self.parse_market(market)
+            except Exception as e:
+                logger.warning("Failed to parse market: %s", e)
+                continue
+            parsed_markets.append(parsed)
+        return parsed_markets
+
+    async def _fetch_event_image(
+        self,
+        event: Dict[str, Any],
+        event_ticker: str,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[str]:
+        """Fetch an event's image URL, falling back to the event's own fields, then its detail."""
+        event_image_url = None
+        async with semaphore:
+            # Fetch event metadata to get image_url (Kalshi stores images in separate endpoint)
+            try:
+                metadata = await self.get_event_metadata(event_ticker)
+                event_image_url = metadata.get("image_url")
+            except Exception as e:
+                logger.debug("Could not fetch metadata for %s: %s", event_ticker, e)
+
+        # Fallback to event fields if metadata failed
+        event_image_url = event_image_url or event.get("image_url") or event.get("image")
+        if event_image_url:
+            return event_image_url
+
+        # Also try to get image from event detail; the batched market query doesn't return it
+        try:
+            async with semaphore:
+                event_markets = await self.get_event_markets(event_ticker)
+        except Exception as e:
+            logger.debug("Could not fetch event detail for %s: %s", event_ticker, e)
+            return None
+        event_detail = event_markets.get("event", {})
+        return event_detail.get("image_url") or event_detail.get("image")
+
+    async def _fetch_event_page(
+        self,
+        events: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        seen_tickers: set,
+    ) -> List[KalshiMarketData]:
+        """Fetch and parse the markets of one page of events, skipping seen tickers."""
+        # Fetch this page's events concurrently, then merge in page order
+        page_events = [
+            (event, event.get("event_ticker") or event.get("ticker"))
+            for event in events
+        ]
+        page_events = [(event, ticker) for event, ticker in page_events if ticker]
+        event_images, markets_by_event = await asyncio.gather(
+            asyncio.gather(*(
+                self._fetch_event_image(event, ticker, semaphore)
+                for event, ticker in page_events
+            )),
+            self.get_markets_for_events([ticker for _, ticker in page_events], semaphore),
+        )
+
+        mark_seen = seen_tickers.add
+        raw_batch = []
+        for (event, event_ticker), event_image_url in zip(page_events, event_images):
+            markets = markets_by_event.get(event_ticker)
+            if markets is None:
+                continue
+
+            for m in markets:
+                # Markets without a ticker can't be stored, so skip them before parsing
+                ticker = m.get("ticker")
+                if not ticker or ticker in seen_tickers:
+                    continue
+                mark_seen(ticker)
+                raw_batch.append((m, event_image_url, event_ticker, event))
+
+        # Parse off the event loop so other requests keep progressing
+        return await asyncio.to_thread(self._parse_batch, raw_batch)
+
     async def fetch_all_markets(self, max_pages: int = 50) -> List[KalshiMarketData]:
         """Fetch all open markets from both /markets and /events endpoints.
 
@@ -199,78 +533,50 @@ class KalshiClient:
         """
         all_markets = []
         seen_tickers = set()
+        mark_seen = seen_tickers.add
 
         # 1. Fetch from /events endpoint (political/economic markets)
         logger.info("Fetching Kalshi events (political/economic markets)...")
-        cursor = None
-        page = 0
+        semaphore = asyncio.Semaphore(EVENT_FETCH_CONCURRENCY)
+        # Pages of events waiting to be processed; paging runs ahead of processing
+        event_pages: asyncio.Queue = asyncio.Queue(maxsize=EVENT_PAGE_QUEUE_SIZE)
 
-        while page < max_pages:
+        async def produce_event_pages():
+            cursor = None
+            page = 0
             try:
-                result = await self.get_events(limit=100, cursor=cursor)
-                events = result.get("events", [])
-
-                for event in events:
-                    event_ticker = event.get("event_ticker") or event.get("ticker")
-                    if not event_ticker:
-                        continue
-
-                    # Fetch event metadata to get image_url (Kalshi stores images in separate endpoint)
-                    event_image_url = None
-                    try:
-                        metadata = await self.get_event_metadata(event_ticker)
-                        event_image_url = metadata.get("image_url")
-                    except Exception as e:
-                        logger.debug(f"Could not fetch metadata for {event_ticker}: {e}")
-
-                    # Fallback to event fields if metadata failed
-                    if not event_image_url:
-                        event_image_url = event.get("image_url") or event.get("image")
-
-                    # Get markets for this event
-                    try:
-                        event_markets = await self.get_event_markets(event_ticker)
-                        markets = event_markets.get("markets", [])
-
-                        # Also try to get image from event detail
-                        event_detail = event_markets.get("event", {})
-                        if not event_image_url:
-                            event_image_url = event_detail.get("image_url") or event_detail.get("image")
-
-                        for m in markets:
-                            ticker = m.get("ticker", "")
-                            if ticker in seen_tickers:
-                                continue
-                            seen_tickers.add(ticker)
-
-                            try:
-                                parsed = self.parse_market(m, event_image_url=event_image_url, event_ticker=event_ticker)
-                                # Add category from event
-                                parsed.category = event.get("category")
-                                all_markets.append(parsed)
-                            except Exception as e:
-                                logger.warning(f"Failed to parse market: {e}")
-
-                        await asyncio.sleep(0.2)  # Rate limit between event market fetches
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch markets for event {event_ticker}: {e}")
-
-                cursor = result.get("cursor")
-                if not cursor or not events:
-                    break
-
-                page += 1
-                await asyncio.sleep(0.5)
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    logger.warning("Kalshi rate limited, waiting 5 seconds...")
-                    await asyncio.sleep(5)
-                    continue
-                raise
+                while page < max_pages:
+                    result = await self.get_events(limit=100, cursor=cursor)
+                    events = result.get("events", [])
+                    if events:
+                        await event_pages.put(events)
+
+                    cursor = result.get("cursor")
+                    if not cursor or not events:
+                        break
+
+                    page += 1
+            finally:
+                for _ in range(EVENT_PAGE_CONSUMERS):
+                    await event_pages.put(None)
+
+        async def consume_event_pages():
+            while (events := await event_pages.get()) is not None:
+                try:
+                    all_markets.extend(await self._fetch_event_page(events, semaphore, seen_tickers))
+                except Exception as e:
+                    logger.warning("Failed to process Kalshi events page: %s", e)
+
+        producer_outcome, *_ = await asyncio.gather(
+            produce_event_pages(),
+            *(consume_event_pages() for _ in range(EVENT_PAGE_CONSUMERS)),
+            return_exceptions=True,
+        )
+        if isinstance(producer_outcome, Exception):
+            raise producer_outcome
 
         event_count = len(all_markets)
-        logger.info(f"Fetched {event_count} markets from Kalshi events")
+        logger.info("Fetched %d markets from Kalshi events", event_count)
 
         # 2. Fetch from /markets endpoint (sports parlays) - limit to avoid duplicates
         logger.info("Fetching Kalshi markets (sports)...")
@@ -278,36 +584,27 @@ class KalshiClient:
         page = 0
 
         while page < min(max_pages, 10):  # Limit sports to 10 pages
-            try:
-                result = await self.get_markets(limit=100, cursor=cursor)
-                markets = result.get("markets", [])
-
-                for m in markets:
-                    ticker = m.get("ticker", "")
-                    if ticker in seen_tickers:
-                        continue
-                    seen_tickers.add(ticker)
-
-                    try:
-                        all_markets.append(self.parse_market(m))
-                    except Exception as e:
-                        logger.warning(f"Failed to parse market: {e}")
+            result = await self.get_markets(limit=100, cursor=cursor)
+            markets = result.get("markets", [])
+
+            raw_batch = []
+            for m in markets:
+                # Markets without a ticker can't be stored, so skip them before parsing
+                ticker = m.get("ticker")
+                if not ticker or ticker in seen_tickers:
+                    continue
+                mark_seen(ticker)
+                raw_batch.append((m, None, None, None))
 
-                cursor = result.get("cursor")
-                if not cursor or not markets:
-                    break
+            all_markets.extend(await asyncio.to_thread(self._parse_batch, raw_batch))
 
-                page += 1
-                await asyncio.sleep(0.5)
+            cursor = result.get("cursor")
+            if not cursor or not markets:
+                break
 
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    logger.warning("Kalshi rate limited, waiting 5 seconds...")
-                    await asyncio.sleep(5)
-                    continue
-                raise
+            page += 1
 
-        logger.info(f"Fetched {len(all_markets)} total markets from Kalshi ({event_count} from events)")
+        logger.info("Fetched %d total markets from Kalshi (%d from events)", len(all_markets), event_count)
         return all_markets
 
 
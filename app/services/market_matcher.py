@@ -5,13 +5,23 @@ Uses fuzzy string matching to find markets that exist on both Kalshi and Polymar
 This replaces the hardcoded regex patterns with automatic discovery.
 """
 import re
+import heapq
+import asyncio
+import hashlib
 import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import datetime
+from operator import attrgetter
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
 from rapidfuzz import fuzz, process
-from sqlalchemy import select, text
+from sqlalchemy import select, text, literal_column, update, table, column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.market import Market, Platform
@@ -19,13 +29,117 @@ from app.models.cross_platform_match import CrossPlatformMatch
 
 logger = logging.getLogger(__name__)
 
+# Kalshi titles scored per cdist call; each block allocates rows x Polymarket titles floats
+MATCH_BLOCK_ROWS = 1024
+
+# The only market columns matching and saving matches read
+MATCH_MARKET_COLUMNS = (
+    Market.id, Market.title, Market.category, Market.yes_price, Market.volume, Market.close_time,
+)
+
+# Cross-platform matches per INSERT ... ON CONFLICT statement
+MATCH_UPSERT_BATCH_SIZE = 500
+# Columns an upsert refreshes on an existing match
+MATCH_REFRESH_COLUMNS = (
+    "kalshi_yes_price", "kalshi_volume", "polymarket_yes_price", "polymarket_volume",
+    "price_gap_cents", "gap_direction", "combined_volume", "last_updated", "is_active",
+)
+
+# Active match ids above which stale-match deactivation joins against a temp
+# table instead of binding one IN (...) parameter per id
+STALE_MATCH_TEMP_TABLE_THRESHOLD = 1000
+_active_match_ids = table("_active_match_ids", column("match_id"))
+
+# Title normalization in one pass; every branch is dropped except whitespace runs,
+# which collapse to a single space
+_TITLE_CLEANUP_RE = re.compile(
+    r'(?P<prefix>^(?=(?:will|does|is)\s)(?:will\s+)?(?:does\s+)?(?:is\s+)?)'  # Common prefixes
+    r'|(?P<suffix>\s*(?:\s+in\s+\d{4})?\??$)'  # Trailing "?", "in 2025" and whitespace
+    r'|(?P<lead>^\s+)'
+    r'|(?P<special>[^\w\s])'  # Keep only alphanumeric and spaces
+    r'|(?P<ws>\s+)'
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Match ID slugs
+_STOPWORDS_RE = re.compile(r'\b(?:will|the|be|a|an|to|in|of|for|on|as)\b')
+_NON_SLUG_CHARS_RE = re.compile(r'[^a-z0-9\s]')
+_HYPHENS_RE = re.compile(r'-+')
+
+# Known false positives: (Kalshi pattern, Polymarket pattern) for different question structures
+_FALSE_POSITIVE_PATTERNS = [
+    (re.compile(r'first.*\$\d+'), re.compile(r'hit.*\$\d+')),  # "first to $X" vs "hit $X"
+    (re.compile(r'before.*\d{4}'), re.compile(r'in.*\d{4}')),  # "before 2025" vs "in 2025"
+]
+
+
+@lru_cache(maxsize=32768)
+def _normalize_title(title: str) -> str:
+    """Normalize title for better matching."""
+    if not title:
+        return ""
+
+    return _TITLE_CLEANUP_RE.sub(_title_cleanup_repl, title.lower())
+
+
+def _title_cleanup_repl(match: re.Match) -> str:
+    return ' ' if match.lastgroup == 'ws' else ''
+
+
+@lru_cache(maxsize=32768)
+def _kalshi_false_positive_patterns(title: str) -> Tuple[Tuple[re.Pattern, re.Pattern], ...]:
+    """False-positive pattern pairs whose Kalshi side matches this title."""
+    lowered = title.lower()
+    return tuple(pair for pair in _FALSE_POSITIVE_PATTERNS if pair[0].search(lowered))
+
+
+def _category_key(category: Optional[str]) -> str:
+    """Bucket key for a market category; empty when the market has none."""
+    return (category or "").strip().lower()
+
+
+@lru_cache(maxsize=32768)
+def _sort_tokens(title: str) -> str:
+    """Title with its whitespace-separated tokens sorted, as token_sort_ratio compares them."""
+    return ' '.join(sorted(title.split()))
+
+
+@lru_cache(maxsize=32768)
+def _generate_match_id(title: str) -> str:
+    """Generate a URL-friendly match ID from title."""
+    if not title:
+        return "unknown"
+
+    match_id = title.lower()
+
+    # Remove common words
+    match_id = _STOPWORDS_RE.sub('', match_id)
+
+    # Keep only alphanumeric and spaces
+    match_id = _NON_SLUG_CHARS_RE.sub('', match_id)
+
+    # Convert spaces to hyphens
+    match_id = _WHITESPACE_RE.sub('-', match_id).strip('-')
+
+    # Remove double hyphens
+    match_id = _HYPHENS_RE.sub('-', match_id)
+
+    # Truncate and ensure uniqueness with hash if needed
+    if len(match_id) > 50:
+        hash_suffix = hashlib.md5(title.encode(), usedforsecurity=False).hexdigest()[:6]
+        match_id = match_id[:43] + '-' + hash_suffix
+
+    return match_id or "unknown"
+
 
 @dataclass
 class MatchCandidate:
     """Internal representation of a potential match."""
-    kalshi: Market
-    polymarket: Market
+    kalshi: Row  # MATCH_MARKET_COLUMNS of the Kalshi market
+    polymarket: Row  # MATCH_MARKET_COLUMNS of the Polymarket market
     similarity: float
+    combined_volume: float = 0.0
+    match_id: str = ""
 
 
 class MarketMatcher:
@@ -49,106 +163,197 @@ class MarketMatcher:
 
         1. Get all Kalshi markets with volume > min_volume
         2. Get all Polymarket markets with volume > min_volume
-        3. For each Kalshi market, fuzzy match against all Polymarket titles
+        3. Fuzzy match every Kalshi title against all Polymarket titles (batched cdist)
         4. If similarity > threshold, it's a match
         """
         # Get Kalshi markets
         kalshi_result = await self.session.execute(
-            select(Market)
+            select(*MATCH_MARKET_COLUMNS)
             .where(Market.platform == Platform.KALSHI)
             .where(Market.volume >= min_volume)
             .where(Market.status.in_(["active", "open"]))
             .where(Market.yes_price.between(min_price, max_price))
         )
-        kalshi_markets = kalshi_result.scalars().all()
+        kalshi_markets = kalshi_result.all()
         logger.info(f"Loaded {len(kalshi_markets)} Kalshi markets for matching")
 
         # Get Polymarket markets
         poly_result = await self.session.execute(
-            select(Market)
+            select(*MATCH_MARKET_COLUMNS)
             .where(Market.platform == Platform.POLYMARKET)
             .where(Market.volume >= min_volume)
             .where(Market.status.in_(["active", "open"]))
             .where(Market.yes_price.between(min_price, max_price))
         )
-        poly_markets = poly_result.scalars().all()
+        poly_markets = poly_result.all()
         logger.info(f"Loaded {len(poly_markets)} Polymarket markets for matching")
 
         if not kalshi_markets or not poly_markets:
             logger.warning("No markets found for one or both platforms")
             return []
 
-        # Build Polymarket lookup
-        poly_lookup: Dict[str, Market] = {}
+        # Build Polymarket lookup (normalized title -> position of its last market)
+        poly_lookup: Dict[str, int] = {}
         poly_titles: List[str] = []
-        for m in poly_markets:
+        for i, m in enumerate(poly_markets):
             normalized = self.normalize_title(m.title)
-            poly_lookup[normalized] = m
+            poly_lookup[normalized] = i
             poly_titles.append(normalized)
 
-        matches: List[MatchCandidate] = []
         seen_poly_ids = set()  # Avoid duplicate matches
+        kalshi_titles = [self.normalize_title(k.title) for k in kalshi_markets]
 
-        for kalshi in kalshi_markets:
-            normalized_kalshi = self.normalize_title(kalshi.title)
-
-            # Find best match in Polymarket using fuzzy matching
-            result = process.extractOne(
-                normalized_kalshi,
-                poly_titles,
-                scorer=fuzz.token_sort_ratio,
-                score_cutoff=self.similarity_threshold
-            )
+        # token_sort_ratio is ratio over token-sorted titles, so sort each title's
+        # tokens once here instead of once per pair inside the scorer
+        kalshi_sorted = [_sort_tokens(t) for t in kalshi_titles]
+        poly_sorted = [_sort_tokens(t) for t in poly_titles]
 
-            if result:
-                matched_title, score, _ = result
-                poly_market = poly_lookup.get(matched_title)
-
-                if poly_market and poly_market.id not in seen_poly_ids:
-                    # Verify it's actually the same event
-                    if self.verify_match(kalshi, poly_market):
-                        matches.append(MatchCandidate(
-                            kalshi=kalshi,
-                            polymarket=poly_market,
-                            similarity=score / 100
-                        ))
-                        seen_poly_ids.add(poly_market.id)
-                        logger.debug(f"Match found: {kalshi.title[:40]}... <-> {poly_market.title[:40]}... ({score}%)")
-
-        # Sort by combined volume
-        matches.sort(
-            key=lambda m: (m.kalshi.volume or 0) + (m.polymarket.volume or 0),
-            reverse=True
+        # cdist releases the GIL; scoring in a worker thread keeps the event loop responsive
+        best_matches = await asyncio.to_thread(
+            self._best_matches_by_category, kalshi_markets, kalshi_sorted, poly_markets, poly_sorted
         )
 
+        # Accepted (Kalshi position, Polymarket position, score)
+        accepted: List[Tuple[int, int, float]] = []
+        for k_pos, (kalshi, (best_idx, score)) in enumerate(zip(kalshi_markets, best_matches)):
+            # Scores under the cutoff come back as 0
+            if score < self.similarity_threshold:
+                continue
+
+            p_pos = poly_lookup[poly_titles[best_idx]]
+            poly_market = poly_markets[p_pos]
+
+            if poly_market.id not in seen_poly_ids:
+                # Verify it's actually the same event
+                if self.verify_match(kalshi, poly_market):
+                    accepted.append((k_pos, p_pos, score))
+                    seen_poly_ids.add(poly_market.id)
+                    logger.debug(f"Match found: {kalshi.title[:40]}... <-> {poly_market.title[:40]}... ({score}%)")
+
+        if not accepted:
+            logger.info("Found 0 cross-platform matches")
+            return []
+
+        # Combined volumes, computed over per-field arrays. Matches are returned
+        # unsorted; callers that want the biggest ones pick them by combined_volume.
+        k_positions, p_positions, scores = zip(*accepted)
+        kalshi_volumes = np.array([k.volume or 0 for k in kalshi_markets], dtype=np.float64)
+        poly_volumes = np.array([p.volume or 0 for p in poly_markets], dtype=np.float64)
+        combined_volumes = (kalshi_volumes[list(k_positions)] + poly_volumes[list(p_positions)]).tolist()
+
+        matches = [
+            MatchCandidate(
+                kalshi=kalshi_markets[k_pos],
+                polymarket=poly_markets[p_pos],
+                similarity=score / 100,
+                combined_volume=combined_volume,
+                match_id=self.generate_match_id(kalshi_markets[k_pos].title),
+            )
+            for k_pos, p_pos, score, combined_volume in zip(k_positions, p_positions, scores, combined_volumes)
+        ]
+
         logger.info(f"Found {len(matches)} cross-platform matches")
         return matches
 
-    def normalize_title(self, title: str) -> str:
-        """Normalize title for better matching."""
-        if not title:
-            return ""
+    def _best_matches_by_category(
+        self,
+        kalshi_markets: List[Row],
+        kalshi_sorted: List[str],
+        poly_markets: List[Row],
+        poly_sorted: List[str],
+    ) -> List[Tuple[int, float]]:
+        """
+        Best (Polymarket index, score) for each Kalshi market, scored against every
+        Polymarket market in one pass.
 
-        title = title.lower()
+        The platforms label categories differently, so category never filters
+        candidates; it only breaks ties, preferring a same-category market among
+        equally scored ones.
+        """
+        best = self._best_matches(kalshi_sorted, poly_sorted)
+
+        poly_by_category: Dict[str, List[int]] = defaultdict(list)
+        poly_titles_by_category: Dict[str, List[str]] = defaultdict(list)
+        for i, m in enumerate(poly_markets):
+            category = _category_key(m.category)
+            poly_by_category[category].append(i)
+            poly_titles_by_category[category].append(poly_sorted[i])
+
+        for k_pos, (idx, score) in enumerate(best):
+            if score < self.similarity_threshold:
+                continue
+            category = _category_key(kalshi_markets[k_pos].category)
+            if not category or _category_key(poly_markets[idx].category) == category:
+                continue
+            same_category = poly_by_category.get(category)
+            if not same_category:
+                continue
+
+            # cdist scores are float32, so allow for rounding against the float64 scorer
+            tied = process.extractOne(
+                kalshi_sorted[k_pos],
+                poly_titles_by_category[category],
+                scorer=fuzz.ratio,
+                score_cutoff=score - 1e-3,
+            )
+            if tied is not None:
+                best[k_pos] = (same_category[tied[2]], score)
 
-        # Remove common prefixes
-        title = re.sub(r'^will\s+', '', title)
-        title = re.sub(r'^does\s+', '', title)
-        title = re.sub(r'^is\s+', '', title)
+        return best
 
-        # Remove question mark and common suffixes
-        title = re.sub(r'\?$', '', title)
-        title = re.sub(r'\s+in\s+\d{4}$', '', title)  # Remove "in 2025"
+    def _best_matches(
+        self,
+        kalshi_sorted: List[str],
+        poly_sorted: List[str],
+    ) -> List[Tuple[int, float]]:
+        """
+        Best (Polymarket index, score) for each token-sorted Kalshi title.
 
-        # Remove platform-specific formatting
-        title = re.sub(r'\s+', ' ', title).strip()
+        Each distinct Kalshi title is scored once.
+        """
+        best_by_title: Dict[str, Tuple[int, float]] = {}
+        # Shortest first, so each block of rows spans a narrow range of lengths
+        pending = sorted(dict.fromkeys(kalshi_sorted), key=len)
+
+        # ratio >= cutoff is impossible unless shorter/longer >= cutoff / (200 - cutoff),
+        # so a block is only scored against Polymarket titles inside its length window
+        min_len_ratio = self.similarity_threshold / (200 - self.similarity_threshold) * (1 - 1e-9)
+        poly_order = sorted(range(len(poly_sorted)), key=lambda i: len(poly_sorted[i]))
+        poly_by_len = [poly_sorted[i] for i in poly_order]
+        poly_lens = [len(t) for t in poly_by_len]
+        poly_positions = np.array(poly_order)
+
+        # Score against the window in one multi-threaded cdist call per block of
+        # rows (keeps the score matrix bounded in memory)
+        for start in range(0, len(pending), MATCH_BLOCK_ROWS):
+            block = pending[start:start + MATCH_BLOCK_ROWS]
+            lo = bisect_left(poly_lens, len(block[0]) * min_len_ratio)
+            hi = bisect_right(poly_lens, len(block[-1]) / min_len_ratio)
+            if lo >= hi:
+                best_by_title.update((t, (0, 0.0)) for t in block)
+                continue
+
+            scores = process.cdist(
+                block,
+                poly_by_len[lo:hi],
+                scorer=fuzz.ratio,
+                score_cutoff=self.similarity_threshold,
+                workers=-1,
+            )
+            best_scores = scores.max(axis=1)
+            # Among tied best scores, keep the earliest Polymarket title as before
+            best_indices = np.where(
+                scores == best_scores[:, None], poly_positions[lo:hi], len(poly_sorted)
+            ).min(axis=1)
+            best_by_title.update(zip(block, zip(best_indices.tolist(), best_scores.tolist())))
 
-        # Remove special characters but keep alphanumeric and spaces
-        title = re.sub(r'[^\w\s]', '', title)
+        return [best_by_title[t] for t in kalshi_sorted]
 
-        return title
+    def normalize_title(self, title: str) -> str:
+        """Normalize title for better matching."""
+        return _normalize_title(title)
 
-    def verify_match(self, kalshi: Market, poly: Market) -> bool:
+    def verify_match(self, kalshi: Row, poly: Row) -> bool:
         """Additional verification that markets are actually the same event."""
         # Skip if titles are too different in length
         len_ratio = len(kalshi.title) / len(poly.title) if poly.title else 0
@@ -161,122 +366,90 @@ class MarketMatcher:
             if diff > 365:
                 return False
 
-        # Skip known false positives
-        false_positive_patterns = [
-            # Different question structures
-            (r'first.*\$\d+', r'hit.*\$\d+'),  # "first to $X" vs "hit $X"
-            (r'before.*\d{4}', r'in.*\d{4}'),  # "before 2025" vs "in 2025"
-        ]
-
-        kalshi_lower = kalshi.title.lower()
-        poly_lower = poly.title.lower()
-
-        for k_pattern, p_pattern in false_positive_patterns:
-            if re.search(k_pattern, kalshi_lower) and not re.search(k_pattern, poly_lower):
-                if re.search(p_pattern, poly_lower):
-                    return False
+        # Skip known false positives (usually no pattern applies to the Kalshi title)
+        fp_patterns = _kalshi_false_positive_patterns(kalshi.title)
+        if fp_patterns:
+            poly_lower = poly.title.lower()
+            if any(
+                not k_pattern.search(poly_lower) and p_pattern.search(poly_lower)
+                for k_pattern, p_pattern in fp_patterns
+            ):
+                return False
 
         return True
 
     def generate_match_id(self, title: str) -> str:
         """Generate a URL-friendly match ID from title."""
-        if not title:
-            return "unknown"
-
-        match_id = title.lower()
-
-        # Remove common words
-        for word in ['will', 'the', 'be', 'a', 'an', 'to', 'in', 'of', 'for', 'on', 'as']:
-            match_id = re.sub(rf'\b{word}\b', '', match_id)
-
-        # Keep only alphanumeric and spaces
-        match_id = re.sub(r'[^a-z0-9\s]', '', match_id)
-
-        # Convert spaces to hyphens
-        match_id = re.sub(r'\s+', '-', match_id).strip('-')
-
-        # Remove double hyphens
-        match_id = re.sub(r'-+', '-', match_id)
-
-        # Truncate and ensure uniqueness with hash if needed
-        if len(match_id) > 50:
-            import hashlib
-            hash_suffix = hashlib.md5(title.encode()).hexdigest()[:6]
-            match_id = match_id[:43] + '-' + hash_suffix
-
-        return match_id or "unknown"
+        return _generate_match_id(title)
 
     async def save_matches(self, matches: List[MatchCandidate]) -> Tuple[int, int]:
         """
-        Save discovered matches to database.
+        Save discovered matches to database with batched INSERT ... ON CONFLICT upserts.
         Returns (new_count, updated_count).
         """
-        new_count = 0
-        updated_count = 0
-
-        for match in matches:
+        now = datetime.utcnow()
+        rows: Dict[str, dict] = {}
+
+        # Calculate gaps (in cents, 0-100 scale) and their direction for all matches at once
+        k_prices = np.array([m.kalshi.yes_price or 0 for m in matches], dtype=np.float64) * 100
+        p_prices = np.array([m.polymarket.yes_price or 0 for m in matches], dtype=np.float64) * 100
+        gaps = np.abs(k_prices - p_prices).tolist()
+        directions = np.select(
+            [k_prices > p_prices, p_prices > k_prices],
+            ["kalshi_higher", "polymarket_higher"],
+            default="equal",
+        ).tolist()
+
+        for match, gap, direction in zip(matches, gaps, directions):
             kalshi = match.kalshi
             poly = match.polymarket
 
-            # Generate match_id from topic
-            match_id = self.generate_match_id(kalshi.title)
-
-            # Calculate gap (in cents, 0-100 scale)
-            k_price = (kalshi.yes_price or 0) * 100
-            p_price = (poly.yes_price or 0) * 100
-            gap = abs(k_price - p_price)
+            refreshed = {
+                "kalshi_yes_price": kalshi.yes_price,
+                "kalshi_volume": kalshi.volume,
+                "polymarket_yes_price": poly.yes_price,
+                "polymarket_volume": poly.volume,
+                "price_gap_cents": gap,
+                "gap_direction": direction,
+                "combined_volume": match.combined_volume,
+                "last_updated": now,
+                "is_active": True,
+            }
 
-            if k_price > p_price:
-                direction = "kalshi_higher"
-            elif p_price > k_price:
-                direction = "polymarket_higher"
-            else:
-                direction = "equal"
+            # A match_id seen earlier in this batch only has its prices refreshed
+            # (PostgreSQL rejects a statement that updates a row twice)
+            if match.match_id in rows:
+                rows[match.match_id].update(refreshed)
+                continue
+
+            rows[match.match_id] = {
+                "match_id": match.match_id,
+                "topic": kalshi.title,  # Use Kalshi title as canonical
+                "category": kalshi.category or poly.category,
+                "kalshi_market_id": kalshi.id,
+                "kalshi_title": kalshi.title,
+                "kalshi_close_time": kalshi.close_time,
+                "polymarket_market_id": poly.id,
+                "polymarket_title": poly.title,
+                "polymarket_close_time": poly.close_time,
+                "similarity_score": match.similarity,
+                **refreshed,
+            }
 
-            # Check if match exists
-            existing = await self.session.execute(
-                select(CrossPlatformMatch).where(CrossPlatformMatch.match_id == match_id)
-            )
-            existing_match = existing.scalar_one_or_none()
-
-            if existing_match:
-                # Update existing match
-                existing_match.kalshi_yes_price = kalshi.yes_price
-                existing_match.kalshi_volume = kalshi.volume
-                existing_match.polymarket_yes_price = poly.yes_price
-                existing_match.polymarket_volume = poly.volume
-                existing_match.price_gap_cents = gap
-                existing_match.gap_direction = direction
-                existing_match.combined_volume = (kalshi.volume or 0) + (poly.volume or 0)
-                existing_match.last_updated = datetime.utcnow()
-                existing_match.is_active = True
-                updated_count += 1
-            else:
-                # Create new match
-                new_match = CrossPlatformMatch(
-                    match_id=match_id,
-                    topic=kalshi.title,  # Use Kalshi title as canonical
-                    category=kalshi.category or poly.category,
-                    kalshi_market_id=kalshi.id,
-                    kalshi_title=kalshi.title,
-                    kalshi_yes_price=kalshi.yes_price,
-                    kalshi_volume=kalshi.volume,
-                    kalshi_close_time=kalshi.close_time,
-                    polymarket_market_id=poly.id,
-                    polymarket_title=poly.title,
-                    polymarket_yes_price=poly.yes_price,
-                    polymarket_volume=poly.volume,
-                    polymarket_close_time=poly.close_time,
-                    price_gap_cents=gap,
-                    gap_direction=direction,
-                    combined_volume=(kalshi.volume or 0) + (poly.volume or 0),
-                    similarity_score=match.similarity,
-                    is_active=True,
-                )
-                self.session.add(new_match)
-                new_count += 1
+        # Existing matches only get their prices, volumes and status refreshed
+        values = list(rows.values())
+        new_count = 0
+        for start in range(0, len(values), MATCH_UPSERT_BATCH_SIZE):
+            stmt = insert(CrossPlatformMatch).values(values[start:start + MATCH_UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["match_id"],
+                set_={column: stmt.excluded[column] for column in MATCH_REFRESH_COLUMNS},
+            ).returning(literal_column("xmax = 0"))  # True for freshly inserted rows
+            result = await self.session.execute(stmt)
+            new_count += sum(result.scalars())
 
         await self.session.commit()
+        updated_count = len(values) - new_count
         logger.info(f"Saved matches: {new_count} new, {updated_count} updated")
         return new_count, updated_count
 
@@ -285,12 +458,23 @@ class MarketMatcher:
         if not active_match_ids:
             return 0
 
-        # Use SQLAlchemy ORM for proper parameter binding
-        from sqlalchemy import update
+        active = CrossPlatformMatch.match_id.not_in(active_match_ids)
+        if len(active_match_ids) > STALE_MATCH_TEMP_TABLE_THRESHOLD:
+            # Stage the ids so Postgres can hash anti-join them; dropped on commit
+            await self.session.execute(text(
+                "CREATE TEMP TABLE IF NOT EXISTS _active_match_ids "
+                "(match_id varchar PRIMARY KEY) ON COMMIT DROP"
+            ))
+            await self.session.execute(
+                _active_match_ids.insert(),
+                [{"match_id": match_id} for match_id in set(active_match_ids)],
+            )
+            active = CrossPlatformMatch.match_id.not_in(select(_active_match_ids.c.match_id))
+
         result = await self.session.execute(
             update(CrossPlatformMatch)
             .where(CrossPlatformMatch.is_active == True)
-            .where(CrossPlatformMatch.match_id.not_in(active_match_ids))
+            .where(active)
             .values(is_active=False, last_updated=datetime.utcnow())
         )
         await self.session.commit()
@@ -326,7 +510,7 @@ async def run_market_matching(min_volume: float = 1000) -> Dict:
         new_count, updated_count = await matcher.save_matches(matches)
 
         # Deactivate stale matches
-        active_ids = [matcher.generate_match_id(m.kalshi.title) for m in matches]
+        active_ids = [m.match_id for m in matches]
         deactivated = await matcher.deactivate_stale_matches(active_ids)
 
         return {
@@ -341,9 +525,9 @@ async def run_market_matching(min_volume: float = 1000) -> Dict:
                     "kalshi_price": (m.kalshi.yes_price or 0) * 100,
                     "poly_price": (m.polymarket.yes_price or 0) * 100,
                     "gap_cents": abs((m.kalshi.yes_price or 0) - (m.polymarket.yes_price or 0)) * 100,
-                    "combined_volume": (m.kalshi.volume or 0) + (m.polymarket.volume or 0),
+                    "combined_volume": m.combined_volume,
                     "similarity": m.similarity,
                 }
-                for m in matches[:10]
+                for m in heapq.nlargest(10, matches, key=attrgetter("combined_volume"))
             ],
         }
@@ -1,16 +1,31 @@
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-import json
+from functools import lru_cache
+from html import escape
+from typing import Optional, List, Dict, Any, Tuple, Awaitable, Callable
+from datetime import date, datetime, timezone
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
+from fastapi import BackgroundTasks
 
 from app.config import get_settings
+from app.services.email import (
+    ALERT_EMAIL_CONCURRENCY,
+    SENDGRID_MAX_PERSONALIZATIONS,
+    close_http_client,
+    post_to_sendgrid,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Replaced per recipient by SendGrid in bulk digest sends. The HTML part gets an
+# escaped copy of the greeting, so each part has its own tag (neither contains the other).
+GREETING_TEXT_SUBSTITUTION_TAG = "-greeting_text-"
+GREETING_HTML_SUBSTITUTION_TAG = "-greeting_html-"
+
+# Score badge colors for scores below 50, 50-69 and 70+
+_SCORE_COLORS = ('#ef4444', '#f59e0b', '#22c55e')
+
 # Brand constants for email templates
 BRAND = {
     "logo_url": "https://oddwons.ai/oddwons-logo.png",  # Must be publicly accessible
@@ -26,14 +41,15 @@ BRAND = {
     "accent": "#06b6d4",  # Cyan accent
 }
 
-def get_email_base_template(content: str, title: str = "") -> str:
-    """Wrap email content in branded base template."""
-    return f'''<!DOCTYPE html>
+
+# Email skeletons are built once at import with the brand colors baked in;
+# each send only fills in the per-email fields with str.format.
+_BASE_TEMPLATE = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>{{title}}</title>
 </head>
 <body style="margin: 0; padding: 0; background-color: {BRAND["light_bg"]}; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #1e293b;">
     <!-- Outer container with pattern background -->
@@ -64,7 +80,7 @@ def get_email_base_template(content: str, title: str = "") -> str:
                     <!-- Content area -->
                     <tr>
                         <td style="padding: 40px;">
-                            {content}
+                            {{content}}
                         </td>
                     </tr>
                     <!-- Footer -->
@@ -89,7 +105,7 @@ def get_email_base_template(content: str, title: str = "") -> str:
                                 </tr>
                             </table>
                             <p style="margin: 0; color: #64748b; font-size: 12px;">
-                                &copy; {datetime.utcnow().year} OddWons. All rights reserved.
+                                &copy; {{year}} OddWons. All rights reserved.
                             </p>
                         </td>
                     </tr>
@@ -101,6 +117,37 @@ def get_email_base_template(content: str, title: str = "") -> str:
 </html>'''
 
 
+# Layout before and after the content slot; formatted pieces are cached so
+# each email only concatenates its own content between them
+_BASE_HEAD, _BASE_TAIL = _BASE_TEMPLATE.split("{content}")
+
+
+@lru_cache(maxsize=32)
+def _base_head(title: str) -> str:
+    return _BASE_HEAD.format(title=title)
+
+
+@lru_cache(maxsize=2)
+def _base_tail(year: int) -> str:
+    return _BASE_TAIL.format(year=year)
+
+
+def get_email_base_template(content: str, title: str = "") -> str:
+    """Wrap email content in branded base template."""
+    return _base_head(title) + content + _base_tail(datetime.now(timezone.utc).year)
+
+
+@lru_cache(maxsize=4)
+def _format_digest_date(day: date) -> str:
+    """strftime once per day; every digest in a batch shows the same date."""
+    return day.strftime('%B %d, %Y')
+
+
+def _digest_date() -> str:
+    """Today's UTC date as shown in digest emails."""
+    return _format_digest_date(datetime.now(timezone.utc).date())
+
+
 def get_button_html(text: str, url: str, color: str = None) -> str:
     """Generate a branded CTA button."""
     bg_color = color or BRAND["primary"]
@@ -125,95 +172,12 @@ def get_highlight_box(content: str, border_color: str = None) -> str:
     </table>'''
 
 
-class NotificationService:
-    """Service for sending notifications via email, SMS, etc."""
-
-    def __init__(self):
-        self.sendgrid_api_key = settings.sendgrid_api_key
-        self.from_email = settings.from_email
-        self._sg_client: Optional[SendGridAPIClient] = None
-
-    @property
-    def sg_client(self) -> Optional[SendGridAPIClient]:
-        if self._sg_client is None and self.sendgrid_api_key:
-            self._sg_client = SendGridAPIClient(self.sendgrid_api_key)
-        return self._sg_client
-
-    async def send_email(
-        self,
-        to_email: str,
-        subject: str,
-        html_content: str,
-        text_content: Optional[str] = None
-    ) -> bool:
-        """Send an email notification."""
-        if not self.sg_client:
-            logger.warning("SendGrid not configured, skipping email")
-            return False
-
-        try:
-            message = Mail(
-                from_email=Email(self.from_email, "OddWons"),
-                to_emails=To(to_email),
-                subject=subject,
-                html_content=Content("text/html", html_content),
-            )
-
-            if text_content:
-                message.add_content(Content("text/plain", text_content))
-
-            response = self.sg_client.send(message)
-            logger.info(f"Email sent to {to_email}, status: {response.status_code}")
-            return response.status_code in (200, 201, 202)
-
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {e}")
-            return False
-
-    async def send_alert_email(
-        self,
-        to_email: str,
-        alert: Dict[str, Any],
-        user_name: Optional[str] = None
-    ) -> bool:
-        """Send an alert notification email."""
-        subject = f"OddWons Alert: {alert.get('title', 'New Opportunity')}"
-
-        # Build HTML content
-        html_content = self._build_alert_email_html(alert, user_name)
-        text_content = self._build_alert_email_text(alert, user_name)
-
-        return await self.send_email(to_email, subject, html_content, text_content)
-
-    async def send_daily_digest(
-        self,
-        to_email: str,
-        opportunities: List[Dict[str, Any]],
-        user_name: Optional[str] = None
-    ) -> bool:
-        """Send daily digest email with top opportunities."""
-        subject = f"OddWons Daily Digest - {datetime.utcnow().strftime('%B %d, %Y')}"
-
-        html_content = self._build_digest_email_html(opportunities, user_name)
-        text_content = self._build_digest_email_text(opportunities, user_name)
-
-        return await self.send_email(to_email, subject, html_content, text_content)
-
-    async def send_welcome_email(
-        self,
-        to_email: str,
-        user_name: Optional[str] = None
-    ) -> bool:
-        """Send welcome email to new users."""
-        subject = "Welcome to OddWons! 🎯"
-
-        greeting = f"Hi {user_name}," if user_name else "Hey there,"
-
-        content = f'''
+# Welcome body with the brand colors and fixed blocks rendered once at import
+_WELCOME_CONTENT = f'''
             <h1 style="margin: 0 0 8px 0; font-size: 28px; font-weight: 700; color: {BRAND["dark"]};">Welcome aboard!</h1>
             <p style="margin: 0 0 24px 0; color: {BRAND["gray"]}; font-size: 16px;">You've just unlocked smarter prediction market research.</p>
 
-            <p style="margin: 0 0 16px 0; font-size: 16px;">{greeting}</p>
+            <p style="margin: 0 0 16px 0; font-size: 16px;">{{greeting}}</p>
             <p style="margin: 0 0 24px 0; font-size: 16px;">Thanks for joining OddWons! We're here to help you stay on top of prediction markets across Kalshi and Polymarket.</p>
 
             {get_highlight_box(f"""
@@ -293,9 +257,7 @@ class NotificationService:
             </p>
         '''
 
-        html_content = get_email_base_template(content, "Welcome to OddWons!")
-
-        text_content = f"""
+_WELCOME_TEXT = """
 {greeting}
 
 Welcome to OddWons!
@@ -319,34 +281,49 @@ Best,
 The OddWons Team
         """
 
-        return await self.send_email(to_email, subject, html_content, text_content)
-
-    def _build_alert_email_html(self, alert: Dict[str, Any], user_name: Optional[str] = None) -> str:
-        """Build HTML content for alert email."""
-        greeting = f"Hi {user_name}," if user_name else "Hi,"
-        score = alert.get('score', 0)
-        score_color = '#22c55e' if score >= 70 else ('#f59e0b' if score >= 50 else '#ef4444')
-
-        return f"""
+# <head> shared by the notification emails below; each email supplies its
+# header style and any extra rules, and is rendered once at import
+_EMAIL_HEAD = """
         <!DOCTYPE html>
         <html>
         <head>
             <style>
                 body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
                 .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #1f2937; color: white; padding: 20px; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #fff; padding: 20px; border: 1px solid #e5e7eb; border-top: none; }}
-                .score {{ display: inline-block; background: {score_color}; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold; }}
-                .action-box {{ background: #f0fdf4; border: 1px solid #bbf7d0; border-radius: 8px; padding: 15px; margin-top: 15px; }}
+                .header {{ {header} }}
+                .content {{ background: #fff; padding: {content_padding}; border: 1px solid #e5e7eb; border-top: none; }}
                 .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
+                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}{extra_styles}
             </style>
         </head>
-        <body>
+        """
+
+
+def _email_head(header: str, *extra_styles: str, content_padding: str = "30px") -> str:
+    """Render the shared <head> with one email's header style and extra CSS rules."""
+    return _EMAIL_HEAD.format(
+        header=header,
+        content_padding=content_padding,
+        extra_styles="".join(f"\n                {rule}" for rule in extra_styles),
+    )
+
+
+# One alert <head> per score badge color
+_ALERT_HEADS = tuple(
+    _email_head(
+        'background: #1f2937; color: white; padding: 20px; border-radius: 10px 10px 0 0;',
+        f'.score {{ display: inline-block; background: {color}; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold; }}',
+        '.action-box { background: #f0fdf4; border: 1px solid #bbf7d0; border-radius: 8px; padding: 15px; margin-top: 15px; }',
+        content_padding='20px',
+    )
+    for color in _SCORE_COLORS
+)
+
+_ALERT_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
-                    <h2 style="margin: 0;">{alert.get('title', 'New Opportunity Detected')}</h2>
-                    <p style="margin: 10px 0 0 0; opacity: 0.8;">{alert.get('pattern_type', 'Pattern Alert')}</p>
+                    <h2 style="margin: 0;">{title}</h2>
+                    <p style="margin: 10px 0 0 0; opacity: 0.8;">{pattern_type}</p>
                 </div>
                 <div class="content">
                     <p>{greeting}</p>
@@ -354,9 +331,9 @@ The OddWons Team
 
                     <p><strong>Score:</strong> <span class="score">{score}/100</span></p>
 
-                    <p>{alert.get('message', '')}</p>
+                    <p>{message}</p>
 
-                    {f'<div class="action-box"><strong>Suggested Action:</strong><br>{alert.get("action_suggestion", "")}</div>' if alert.get("action_suggestion") else ''}
+                    {action_box}
 
                     <a href="https://oddwons.ai/opportunities" class="button">View Full Details</a>
                 </div>
@@ -369,76 +346,43 @@ The OddWons Team
         </html>
         """
 
-    def _build_alert_email_text(self, alert: Dict[str, Any], user_name: Optional[str] = None) -> str:
-        """Build plain text content for alert email."""
-        greeting = f"Hi {user_name}," if user_name else "Hi,"
-
-        text = f"""
-{greeting}
-
-New Opportunity Detected: {alert.get('title', 'Alert')}
+_ALERT_ACTION_BOX_TEMPLATE = '<div class="action-box"><strong>Suggested Action:</strong><br>{action}</div>'
 
-Score: {alert.get('score', 0)}/100
-
-{alert.get('message', '')}
-"""
-
-        if alert.get('action_suggestion'):
-            text += f"\nSuggested Action: {alert.get('action_suggestion')}"
-
-        text += "\n\nView full details: https://oddwons.ai/opportunities"
-
-        return text
-
-    def _build_digest_email_html(self, opportunities: List[Dict[str, Any]], user_name: Optional[str] = None) -> str:
-        """Build HTML content for daily digest email."""
-        greeting = f"Hi {user_name}," if user_name else "Hi,"
-
-        opp_html = ""
-        for i, opp in enumerate(opportunities[:5], 1):
-            score = opp.get('score', 0)
-            score_color = '#22c55e' if score >= 70 else ('#f59e0b' if score >= 50 else '#ef4444')
-            opp_html += f"""
+_DIGEST_ROW_TEMPLATE = """
             <div style="padding: 15px; border-bottom: 1px solid #e5e7eb;">
                 <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <strong>#{i} {opp.get('title', 'Opportunity')[:50]}...</strong>
+                    <strong>#{i} {title}...</strong>
                     <span style="background: {score_color}; color: white; padding: 2px 8px; border-radius: 10px; font-size: 12px;">{score}</span>
                 </div>
-                <p style="margin: 5px 0 0 0; font-size: 14px; color: #6b7280;">{opp.get('description', '')[:100]}...</p>
+                <p style="margin: 5px 0 0 0; font-size: 14px; color: #6b7280;">{description}...</p>
             </div>
             """
 
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 20px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
+_DIGEST_EMPTY_HTML = '<p style="padding: 20px; text-align: center; color: #6b7280;">No opportunities detected today. Check back tomorrow!</p>'
+
+_DIGEST_HEAD = _email_head(
+    'background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+    content_padding='20px',
+)
+
+_DIGEST_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Your Daily Digest</h1>
-                    <p>{datetime.utcnow().strftime('%B %d, %Y')}</p>
+                    <p>{date}</p>
                 </div>
                 <div class="content">
                     <p>{greeting}</p>
                     <p>Here are today's top opportunities:</p>
 
                     <div style="border: 1px solid #e5e7eb; border-radius: 8px; overflow: hidden; margin-top: 15px;">
-                        {opp_html if opp_html else '<p style="padding: 20px; text-align: center; color: #6b7280;">No opportunities detected today. Check back tomorrow!</p>'}
+                        {opportunities}
                     </div>
 
                     <a href="https://oddwons.ai/opportunities" class="button">View All Opportunities</a>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                     <p><a href="https://oddwons.ai/settings">Manage notification preferences</a></p>
                 </div>
             </div>
@@ -446,55 +390,12 @@ Score: {alert.get('score', 0)}/100
         </html>
         """
 
-    def _build_digest_email_text(self, opportunities: List[Dict[str, Any]], user_name: Optional[str] = None) -> str:
-        """Build plain text content for daily digest email."""
-        greeting = f"Hi {user_name}," if user_name else "Hi,"
-
-        text = f"""
-{greeting}
-
-Your OddWons Daily Digest - {datetime.utcnow().strftime('%B %d, %Y')}
-
-Top Opportunities:
-"""
-
-        for i, opp in enumerate(opportunities[:5], 1):
-            text += f"\n{i}. {opp.get('title', 'Opportunity')} (Score: {opp.get('score', 0)})"
-            if opp.get('description'):
-                text += f"\n   {opp.get('description')[:80]}..."
-
-        text += "\n\nView all opportunities: https://oddwons.ai/opportunities"
-
-        return text
-
-
-    async def send_password_reset_email(
-        self,
-        to_email: str,
-        reset_token: str,
-        user_name: Optional[str] = None
-    ) -> bool:
-        """Send password reset email."""
-        subject = "Reset Your OddWons Password"
-        reset_url = f"https://oddwons.ai/reset-password?token={reset_token}"
-
-        greeting = f"Hi {user_name}," if user_name else "Hi,"
+_PASSWORD_RESET_HEAD = _email_head(
+    'background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+    '.warning { background: #fef3c7; border: 1px solid #fcd34d; border-radius: 6px; padding: 12px; margin-top: 20px; font-size: 14px; }',
+)
 
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 30px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-                .warning {{ background: #fef3c7; border: 1px solid #fcd34d; border-radius: 6px; padding: 12px; margin-top: 20px; font-size: 14px; }}
-            </style>
-        </head>
-        <body>
+_PASSWORD_RESET_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Password Reset</h1>
@@ -510,14 +411,14 @@ Top Opportunities:
                     </div>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                 </div>
             </div>
         </body>
         </html>
         """
 
-        text_content = f"""
+_PASSWORD_RESET_TEXT_TEMPLATE = """
 {greeting}
 
 We received a request to reset your password.
@@ -530,46 +431,23 @@ Best,
 The OddWons Team
         """
 
-        return await self.send_email(to_email, subject, html_content, text_content)
-
-    async def send_trial_started_email(
-        self,
-        to_email: str,
-        user_name: Optional[str] = None,
-        tier: str = "BASIC",
-        trial_end: Optional[datetime] = None
-    ) -> bool:
-        """Send trial started email."""
-        subject = f"Your OddWons {tier.title()} Trial Has Started!"
-        greeting = f"Hi {user_name}," if user_name else "Hi there,"
-        trial_end_str = trial_end.strftime('%B %d, %Y') if trial_end else "7 days from now"
+_TRIAL_STARTED_HEAD = _email_head(
+    'background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+    '.highlight { background: #f0fdf4; border: 1px solid #bbf7d0; border-radius: 8px; padding: 15px; margin-top: 15px; }',
+)
 
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 30px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-                .highlight {{ background: #f0fdf4; border: 1px solid #bbf7d0; border-radius: 8px; padding: 15px; margin-top: 15px; }}
-            </style>
-        </head>
-        <body>
+_TRIAL_STARTED_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Your Trial Has Started!</h1>
-                    <p>{tier.title()} Plan</p>
+                    <p>{tier} Plan</p>
                 </div>
                 <div class="content">
                     <p>{greeting}</p>
-                    <p>Welcome to OddWons {tier.title()}! Your 7-day free trial is now active.</p>
+                    <p>Welcome to OddWons {tier}! Your 7-day free trial is now active.</p>
                     <div class="highlight">
-                        <strong>Trial ends:</strong> {trial_end_str}<br>
-                        <strong>Plan:</strong> {tier.title()}
+                        <strong>Trial ends:</strong> {trial_end}<br>
+                        <strong>Plan:</strong> {tier}
                     </div>
                     <p>During your trial, you'll have full access to:</p>
                     <ul>
@@ -582,20 +460,20 @@ The OddWons Team
                     <a href="https://oddwons.ai/dashboard" class="button">Go to Dashboard</a>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                 </div>
             </div>
         </body>
         </html>
         """
 
-        text_content = f"""
+_TRIAL_STARTED_TEXT_TEMPLATE = """
 {greeting}
 
-Your OddWons {tier.title()} trial has started!
+Your OddWons {tier} trial has started!
 
-Trial ends: {trial_end_str}
-Plan: {tier.title()}
+Trial ends: {trial_end}
+Plan: {tier}
 
 During your trial, you'll have full access to all features. Explore everything OddWons has to offer!
 
@@ -605,45 +483,24 @@ Best,
 The OddWons Team
         """
 
-        return await self.send_email(to_email, subject, html_content, text_content)
-
-    async def send_subscription_confirmed_email(
-        self,
-        to_email: str,
-        user_name: Optional[str] = None,
-        tier: str = "BASIC"
-    ) -> bool:
-        """Send subscription confirmed email."""
-        subject = f"Welcome to OddWons {tier.title()}!"
-        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+_SUBSCRIPTION_CONFIRMED_HEAD = _email_head(
+    'background: linear-gradient(135deg, #22c55e, #16a34a); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+)
 
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #22c55e, #16a34a); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 30px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
+_SUBSCRIPTION_CONFIRMED_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Subscription Confirmed!</h1>
-                    <p>{tier.title()} Plan</p>
+                    <p>{tier} Plan</p>
                 </div>
                 <div class="content">
                     <p>{greeting}</p>
-                    <p>Thank you for subscribing to OddWons {tier.title()}! Your subscription is now active.</p>
-                    <p>You now have full access to all {tier.title()} features. We're excited to help you stay informed on prediction markets!</p>
+                    <p>Thank you for subscribing to OddWons {tier}! Your subscription is now active.</p>
+                    <p>You now have full access to all {tier} features. We're excited to help you stay informed on prediction markets!</p>
                     <a href="https://oddwons.ai/dashboard" class="button">Go to Dashboard</a>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                     <p><a href="https://oddwons.ai/settings">Manage your subscription</a></p>
                 </div>
             </div>
@@ -651,12 +508,12 @@ The OddWons Team
         </html>
         """
 
-        text_content = f"""
+_SUBSCRIPTION_CONFIRMED_TEXT_TEMPLATE = """
 {greeting}
 
-Thank you for subscribing to OddWons {tier.title()}!
+Thank you for subscribing to OddWons {tier}!
 
-Your subscription is now active. You have full access to all {tier.title()} features.
+Your subscription is now active. You have full access to all {tier} features.
 
 Visit https://oddwons.ai/dashboard to explore.
 
@@ -664,55 +521,34 @@ Best,
 The OddWons Team
         """
 
-        return await self.send_email(to_email, subject, html_content, text_content)
+_SUBSCRIPTION_CANCELLED_HEAD = _email_head(
+    'background: #1f2937; color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+)
 
-    async def send_subscription_cancelled_email(
-        self,
-        to_email: str,
-        user_name: Optional[str] = None,
-        tier: str = "BASIC"
-    ) -> bool:
-        """Send subscription cancelled email."""
-        subject = "Your OddWons Subscription Has Been Cancelled"
-        greeting = f"Hi {user_name}," if user_name else "Hi there,"
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #1f2937; color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 30px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
+_SUBSCRIPTION_CANCELLED_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Subscription Cancelled</h1>
                 </div>
                 <div class="content">
                     <p>{greeting}</p>
-                    <p>Your OddWons {tier.title()} subscription has been cancelled.</p>
+                    <p>Your OddWons {tier} subscription has been cancelled.</p>
                     <p>We're sorry to see you go! If you change your mind, you can resubscribe anytime from your settings page.</p>
                     <p>You still have access to our free tier with limited features.</p>
                     <a href="https://oddwons.ai/settings" class="button">Resubscribe</a>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                 </div>
             </div>
         </body>
         </html>
         """
 
-        text_content = f"""
+_SUBSCRIPTION_CANCELLED_TEXT_TEMPLATE = """
 {greeting}
 
-Your OddWons {tier.title()} subscription has been cancelled.
+Your OddWons {tier} subscription has been cancelled.
 
 We're sorry to see you go! If you change your mind, you can resubscribe anytime at https://oddwons.ai/settings
 
@@ -722,32 +558,12 @@ Best,
 The OddWons Team
         """
 
-        return await self.send_email(to_email, subject, html_content, text_content)
+_PAYMENT_FAILED_HEAD = _email_head(
+    'background: #ef4444; color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+    '.warning { background: #fef2f2; border: 1px solid #fecaca; border-radius: 8px; padding: 15px; margin-top: 15px; }',
+)
 
-    async def send_payment_failed_email(
-        self,
-        to_email: str,
-        user_name: Optional[str] = None
-    ) -> bool:
-        """Send payment failed email."""
-        subject = "Action Required: Payment Failed for OddWons"
-        greeting = f"Hi {user_name}," if user_name else "Hi there,"
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #ef4444; color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 30px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-                .warning {{ background: #fef2f2; border: 1px solid #fecaca; border-radius: 8px; padding: 15px; margin-top: 15px; }}
-            </style>
-        </head>
-        <body>
+_PAYMENT_FAILED_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Payment Failed</h1>
@@ -767,14 +583,14 @@ The OddWons Team
                     <a href="https://oddwons.ai/settings" class="button">Update Payment Method</a>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                 </div>
             </div>
         </body>
         </html>
         """
 
-        text_content = f"""
+_PAYMENT_FAILED_TEXT_TEMPLATE = """
 {greeting}
 
 We were unable to process your payment for OddWons.
@@ -785,46 +601,24 @@ Best,
 The OddWons Team
         """
 
-        return await self.send_email(to_email, subject, html_content, text_content)
-
-    async def send_trial_ending_email(
-        self,
-        to_email: str,
-        user_name: Optional[str] = None,
-        days_remaining: int = 1,
-        tier: str = "BASIC"
-    ) -> bool:
-        """Send trial ending reminder email."""
-        subject = f"Your OddWons Trial Ends in {days_remaining} Day{'s' if days_remaining != 1 else ''}"
-        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+_TRIAL_ENDING_HEAD = _email_head(
+    'background: linear-gradient(135deg, #f59e0b, #d97706); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center;',
+    '.highlight { background: #fffbeb; border: 1px solid #fcd34d; border-radius: 8px; padding: 15px; margin-top: 15px; }',
+)
 
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #f59e0b, #d97706); color: white; padding: 30px; border-radius: 10px 10px 0 0; text-align: center; }}
-                .content {{ background: #fff; padding: 30px; border: 1px solid #e5e7eb; border-top: none; }}
-                .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin-top: 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }}
-                .highlight {{ background: #fffbeb; border: 1px solid #fcd34d; border-radius: 8px; padding: 15px; margin-top: 15px; }}
-            </style>
-        </head>
-        <body>
+_TRIAL_ENDING_HTML_TEMPLATE = """<body>
             <div class="container">
                 <div class="header">
                     <h1>Trial Ending Soon</h1>
-                    <p>{days_remaining} day{'s' if days_remaining != 1 else ''} remaining</p>
+                    <p>{days_remaining} day{plural} remaining</p>
                 </div>
                 <div class="content">
                     <p>{greeting}</p>
-                    <p>Your OddWons {tier.title()} trial ends in {days_remaining} day{'s' if days_remaining != 1 else ''}.</p>
+                    <p>Your OddWons {tier} trial ends in {days_remaining} day{plural}.</p>
                     <div class="highlight">
-                        <strong>Don't lose access!</strong> Subscribe now to keep your {tier.title()} features.
+                        <strong>Don't lose access!</strong> Subscribe now to keep your {tier} features.
                     </div>
-                    <p>What you'll keep with {tier.title()}:</p>
+                    <p>What you'll keep with {tier}:</p>
                     <ul>
                         <li>AI-powered market insights</li>
                         <li>Cross-platform price comparisons</li>
@@ -834,26 +628,537 @@ The OddWons Team
                     <a href="https://oddwons.ai/settings" class="button">Subscribe Now</a>
                 </div>
                 <div class="footer">
-                    <p>&copy; {datetime.utcnow().year} OddWons. All rights reserved.</p>
+                    <p>&copy; {year} OddWons. All rights reserved.</p>
                 </div>
             </div>
         </body>
         </html>
         """
 
-        text_content = f"""
+_TRIAL_ENDING_TEXT_TEMPLATE = """
 {greeting}
 
-Your OddWons {tier.title()} trial ends in {days_remaining} day{'s' if days_remaining != 1 else ''}.
+Your OddWons {tier} trial ends in {days_remaining} day{plural}.
 
-Don't lose access! Subscribe now at https://oddwons.ai/settings to keep your {tier.title()} features.
+Don't lose access! Subscribe now at https://oddwons.ai/settings to keep your {tier} features.
 
 Best,
 The OddWons Team
         """
 
+
+class NotificationService:
+    """Service for sending notifications via email, SMS, etc."""
+
+    def __init__(self):
+        self.sendgrid_api_key = settings.sendgrid_api_key
+        self.from_email = settings.from_email
+        # Sender block shared by every payload; only ever read when serializing
+        self._sender = {"email": self.from_email, "name": "OddWons"}
+
+    async def aclose(self):
+        """Close the shared SendGrid connection pool."""
+        await close_http_client()
+
+    async def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """Send an email notification."""
+        if not self.sendgrid_api_key:
+            logger.warning("SendGrid not configured, skipping email")
+            return False
+
+        # SendGrid requires text/plain to come before text/html
+        content = [{"type": "text/html", "value": html_content}]
+        if text_content:
+            content.insert(0, {"type": "text/plain", "value": text_content})
+
+        payload = {
+            "personalizations": [{"to": [{"email": to_email}]}],
+            "from": self._sender,
+            "subject": subject,
+            "content": content,
+        }
+
+        try:
+            # Posts on the shared keep-alive client instead of the blocking SDK
+            response = await post_to_sendgrid(payload)
+            logger.info(f"Email sent to {to_email}, status: {response.status_code}")
+            return response.status_code in (200, 201, 202)
+
+        except Exception as e:
+            logger.error(f"Failed to send email to {to_email}: {e}")
+            return False
+
+    async def send_alert_email(
+        self,
+        to_email: str,
+        alert: Dict[str, Any],
+        user_name: Optional[str] = None
+    ) -> bool:
+        """Send an alert notification email."""
+        subject = f"OddWons Alert: {alert.get('title', 'New Opportunity')}"
+
+        # Build HTML content
+        html_content = self._build_alert_email_html(alert, user_name)
+        text_content = self._build_alert_email_text(alert, user_name)
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_daily_digest(
+        self,
+        to_email: str,
+        opportunities: List[Dict[str, Any]],
+        user_name: Optional[str] = None
+    ) -> bool:
+        """Send daily digest email with top opportunities."""
+        date_str = _digest_date()
+        subject = f"OddWons Daily Digest - {date_str}"
+
+        html_content = self._build_digest_email_html(opportunities, user_name, date_str)
+        text_content = self._build_digest_email_text(opportunities, user_name, date_str)
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_email_batch(
+        self,
+        recipients: List[Dict[str, Any]],
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> int:
+        """
+        Send the same email to many recipients, one SendGrid call per 1000.
+
+        Each recipient is {"email": ..., "substitutions": {tag: value}}; SendGrid
+        replaces each tag in the subject and body per recipient.
+        Returns the number of recipients SendGrid accepted.
+        """
+        if not self.sendgrid_api_key:
+            logger.warning("SendGrid not configured, skipping email")
+            return 0
+
+        # SendGrid requires text/plain to come before text/html
+        content = [{"type": "text/html", "value": html_content}]
+        if text_content:
+            content.insert(0, {"type": "text/plain", "value": text_content})
+
+        async def send_chunk(chunk: List[Dict[str, Any]]) -> int:
+            payload = {
+                "personalizations": [
+                    {"to": [{"email": r["email"]}], "substitutions": r.get("substitutions", {})}
+                    for r in chunk
+                ],
+                "from": self._sender,
+                "subject": subject,
+                "content": content,
+            }
+            try:
+                response = await post_to_sendgrid(payload)
+                logger.info(f"Email sent to {len(chunk)} recipients, status: {response.status_code}")
+                return len(chunk) if response.status_code in (200, 201, 202) else 0
+            except Exception as e:
+                logger.error(f"Failed to send email to {len(chunk)} recipients: {e}")
+                return 0
+
+        sent = await asyncio.gather(*(
+            send_chunk(recipients[start:start + SENDGRID_MAX_PERSONALIZATIONS])
+            for start in range(0, len(recipients), SENDGRID_MAX_PERSONALIZATIONS)
+        ))
+        return sum(sent)
+
+    async def send_digest_bulk(
+        self,
+        recipients: List[Tuple[str, Optional[str]]],
+        opportunities: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Send the same daily digest to many users in batched SendGrid calls.
+
+        Each recipient is (email, name); the body is rendered once and the
+        greeting is filled in per recipient via SendGrid substitutions.
+        Returns the number of recipients SendGrid accepted.
+        """
+        date_str = _digest_date()
+        html_content = self._build_digest_email_html(
+            opportunities, date_str=date_str, greeting=GREETING_HTML_SUBSTITUTION_TAG
+        )
+        text_content = self._build_digest_email_text(
+            opportunities, date_str=date_str, greeting=GREETING_TEXT_SUBSTITUTION_TAG
+        )
+
+        batch = []
+        for email, name in recipients:
+            greeting = f"Hi {name}," if name else "Hi,"
+            batch.append({
+                "email": email,
+                "substitutions": {
+                    GREETING_TEXT_SUBSTITUTION_TAG: greeting,
+                    GREETING_HTML_SUBSTITUTION_TAG: escape(greeting),
+                },
+            })
+
+        return await self.send_email_batch(
+            batch,
+            f"OddWons Daily Digest - {date_str}",
+            html_content,
+            text_content
+        )
+
+    async def send_welcome_email(
+        self,
+        to_email: str,
+        user_name: Optional[str] = None
+    ) -> bool:
+        """Send welcome email to new users."""
+        subject = "Welcome to OddWons! 🎯"
+
+        greeting = f"Hi {user_name}," if user_name else "Hey there,"
+
+        content = _WELCOME_CONTENT.format(greeting=escape(greeting))
+
+        html_content = get_email_base_template(content, "Welcome to OddWons!")
+
+        text_content = _WELCOME_TEXT.format(greeting=greeting)
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    def _build_alert_email_html(self, alert: Dict[str, Any], user_name: Optional[str] = None) -> str:
+        """Build HTML content for alert email."""
+        greeting = f"Hi {user_name}," if user_name else "Hi,"
+        score = alert.get('score', 0)
+        action_box = (
+            _ALERT_ACTION_BOX_TEMPLATE.format(action=escape(str(alert.get("action_suggestion", ""))))
+            if alert.get("action_suggestion") else ''
+        )
+
+        return _ALERT_HEADS[(score >= 50) + (score >= 70)] + _ALERT_HTML_TEMPLATE.format(
+            title=escape(str(alert.get('title', 'New Opportunity Detected'))),
+            pattern_type=escape(str(alert.get('pattern_type', 'Pattern Alert'))),
+            greeting=escape(greeting),
+            score=score,
+            message=escape(str(alert.get('message', ''))),
+            action_box=action_box,
+        )
+
+    def _build_alert_email_text(self, alert: Dict[str, Any], user_name: Optional[str] = None) -> str:
+        """Build plain text content for alert email."""
+        greeting = f"Hi {user_name}," if user_name else "Hi,"
+
+        text = f"""
+{greeting}
+
+New Opportunity Detected: {alert.get('title', 'Alert')}
+
+Score: {alert.get('score', 0)}/100
+
+{alert.get('message', '')}
+"""
+
+        if alert.get('action_suggestion'):
+            text += f"\nSuggested Action: {alert.get('action_suggestion')}"
+
+        text += "\n\nView full details: https://oddwons.ai/opportunities"
+
+        return text
+
+    def _build_digest_email_html(
+        self,
+        opportunities: List[Dict[str, Any]],
+        user_name: Optional[str] = None,
+        date_str: Optional[str] = None,
+        greeting: Optional[str] = None
+    ) -> str:
+        """Build HTML content for daily digest email."""
+        greeting = greeting or (f"Hi {user_name}," if user_name else "Hi,")
+        date_str = date_str or _digest_date()
+
+        opp_html = ""
+        for i, opp in enumerate(opportunities[:5], 1):
+            score = opp.get('score', 0)
+            score_color = _SCORE_COLORS[(score >= 50) + (score >= 70)]
+            opp_html += _DIGEST_ROW_TEMPLATE.format(
+                i=i,
+                title=escape(opp.get('title', 'Opportunity')[:50]),
+                score=score,
+                score_color=score_color,
+                description=escape(opp.get('description', '')[:100]),
+            )
+
+        return _DIGEST_HEAD + _DIGEST_HTML_TEMPLATE.format(
+            date=date_str,
+            greeting=escape(greeting),
+            opportunities=opp_html or _DIGEST_EMPTY_HTML,
+            year=datetime.now(timezone.utc).year,
+        )
+
+    def _build_digest_email_text(
+        self,
+        opportunities: List[Dict[str, Any]],
+        user_name: Optional[str] = None,
+        date_str: Optional[str] = None,
+        greeting: Optional[str] = None
+    ) -> str:
+        """Build plain text content for daily digest email."""
+        greeting = greeting or (f"Hi {user_name}," if user_name else "Hi,")
+        date_str = date_str or _digest_date()
+
+        text = f"""
+{greeting}
+
+Your OddWons Daily Digest - {date_str}
+
+Top Opportunities:
+"""
+
+        for i, opp in enumerate(opportunities[:5], 1):
+            text += f"\n{i}. {opp.get('title', 'Opportunity')} (Score: {opp.get('score', 0)})"
+            if opp.get('description'):
+                text += f"\n   {opp.get('description')[:80]}..."
+
+        text += "\n\nView all opportunities: https://oddwons.ai/opportunities"
+
+        return text
+
+
+    async def send_password_reset_email(
+        self,
+        to_email: str,
+        reset_token: str,
+        user_name: Optional[str] = None
+    ) -> bool:
+        """Send password reset email."""
+        subject = "Reset Your OddWons Password"
+        reset_url = f"https://oddwons.ai/reset-password?token={reset_token}"
+
+        greeting = f"Hi {user_name}," if user_name else "Hi,"
+
+        html_content = _PASSWORD_RESET_HEAD + _PASSWORD_RESET_HTML_TEMPLATE.format(
+            greeting=escape(greeting), reset_url=reset_url, year=datetime.now(timezone.utc).year
+        )
+
+        text_content = _PASSWORD_RESET_TEXT_TEMPLATE.format(greeting=greeting, reset_url=reset_url)
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_trial_started_email(
+        self,
+        to_email: str,
+        user_name: Optional[str] = None,
+        tier: str = "BASIC",
+        trial_end: Optional[datetime] = None
+    ) -> bool:
+        """Send trial started email."""
+        subject = f"Your OddWons {tier.title()} Trial Has Started!"
+        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+        trial_end_str = trial_end.strftime('%B %d, %Y') if trial_end else "7 days from now"
+
+        html_content = _TRIAL_STARTED_HEAD + _TRIAL_STARTED_HTML_TEMPLATE.format(
+            tier=tier.title(),
+            greeting=escape(greeting),
+            trial_end=trial_end_str,
+            year=datetime.now(timezone.utc).year,
+        )
+
+        text_content = _TRIAL_STARTED_TEXT_TEMPLATE.format(
+            greeting=greeting,
+            tier=tier.title(),
+            trial_end=trial_end_str,
+        )
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_subscription_confirmed_email(
+        self,
+        to_email: str,
+        user_name: Optional[str] = None,
+        tier: str = "BASIC"
+    ) -> bool:
+        """Send subscription confirmed email."""
+        subject = f"Welcome to OddWons {tier.title()}!"
+        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+
+        html_content = _SUBSCRIPTION_CONFIRMED_HEAD + _SUBSCRIPTION_CONFIRMED_HTML_TEMPLATE.format(
+            tier=tier.title(),
+            greeting=escape(greeting),
+            year=datetime.now(timezone.utc).year,
+        )
+
+        text_content = _SUBSCRIPTION_CONFIRMED_TEXT_TEMPLATE.format(greeting=greeting, tier=tier.title())
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_subscription_cancelled_email(
+        self,
+        to_email: str,
+        user_name: Optional[str] = None,
+        tier: str = "BASIC"
+    ) -> bool:
+        """Send subscription cancelled email."""
+        subject = "Your OddWons Subscription Has Been Cancelled"
+        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+
+        html_content = _SUBSCRIPTION_CANCELLED_HEAD + _SUBSCRIPTION_CANCELLED_HTML_TEMPLATE.format(
+            greeting=escape(greeting),
+            tier=tier.title(),
+            year=datetime.now(timezone.utc).year,
+        )
+
+        text_content = _SUBSCRIPTION_CANCELLED_TEXT_TEMPLATE.format(greeting=greeting, tier=tier.title())
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_payment_failed_email(
+        self,
+        to_email: str,
+        user_name: Optional[str] = None
+    ) -> bool:
+        """Send payment failed email."""
+        subject = "Action Required: Payment Failed for OddWons"
+        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+
+        html_content = _PAYMENT_FAILED_HEAD + _PAYMENT_FAILED_HTML_TEMPLATE.format(
+            greeting=escape(greeting),
+            year=datetime.now(timezone.utc).year,
+        )
+
+        text_content = _PAYMENT_FAILED_TEXT_TEMPLATE.format(greeting=greeting)
+
+        return await self.send_email(to_email, subject, html_content, text_content)
+
+    async def send_trial_ending_email(
+        self,
+        to_email: str,
+        user_name: Optional[str] = None,
+        days_remaining: int = 1,
+        tier: str = "BASIC"
+    ) -> bool:
+        """Send trial ending reminder email."""
+        plural = 's' if days_remaining != 1 else ''
+        subject = f"Your OddWons Trial Ends in {days_remaining} Day{plural}"
+        greeting = f"Hi {user_name}," if user_name else "Hi there,"
+
+        html_content = _TRIAL_ENDING_HEAD + _TRIAL_ENDING_HTML_TEMPLATE.format(
+            days_remaining=days_remaining,
+            plural=plural,
+            greeting=escape(greeting),
+            tier=tier.title(),
+            year=datetime.now(timezone.utc).year,
+        )
+
+        text_content = _TRIAL_ENDING_TEXT_TEMPLATE.format(
+            greeting=greeting,
+            tier=tier.title(),
+            days_remaining=days_remaining,
+            plural=plural,
+        )
+
         return await self.send_email(to_email, subject, html_content, text_content)
 
 
 # Singleton instance
 notification_service = NotificationService()
+
+
+async def _deliver_email(send: Callable[..., Awaitable[bool]], **kwargs: Any) -> None:
+    """Send a notification email, logging instead of raising on failure."""
+    try:
+        await send(**kwargs)
+    except Exception as e:
+        logger.warning(f"Failed to send {send.__name__}: {e}")
+
+
+async def send_email_after_response(
+    background_tasks: Optional[BackgroundTasks],
+    send: Callable[..., Awaitable[bool]],
+    **kwargs: Any,
+) -> None:
+    """Send a notification email once the HTTP response has gone out.
+
+    Stripe webhook bursts and API requests then don't wait on SendGrid round trips.
+    Without background_tasks the email is sent inline.
+    """
+    if background_tasks is not None:
+        background_tasks.add_task(_deliver_email, send, **kwargs)
+    else:
+        await _deliver_email(send, **kwargs)
+
+
+async def send_pending_alert_emails() -> int:
+    """
+    Email a batch of unsent alerts to their users, ALERT_EMAIL_CONCURRENCY at a time.
+
+    Shared by the API scheduler and the worker process. Alerts whose user is gone or
+    has alert emails off are marked sent to skip them; failed sends stay pending.
+    Returns the number of emails sent.
+    """
+    from sqlalchemy import select, and_
+    from app.core.database import AsyncSessionLocal
+    from app.models.market import Alert
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as session:
+        # Find alerts that haven't been emailed yet, with their users in the same query
+        result = await session.execute(
+            select(Alert, User).outerjoin(User, Alert.user_id == User.id).where(
+                and_(
+                    Alert.email_sent == False,
+                    Alert.user_id.isnot(None)
+                )
+            ).limit(50)  # Process in batches
+        )
+        alerts = result.all()
+
+        if not alerts:
+            logger.info("No pending alert emails")
+            return 0
+
+        pending = []
+        for alert, user in alerts:
+            if not user or not user.email_alerts_enabled:
+                # Mark as sent to skip in future
+                alert.email_sent = True
+                continue
+
+            pending.append((alert, user))
+
+        # Send concurrently over the shared SendGrid pool instead of one after another
+        semaphore = asyncio.Semaphore(ALERT_EMAIL_CONCURRENCY)
+
+        async def send(alert, user) -> bool:
+            async with semaphore:
+                return await notification_service.send_alert_email(
+                    to_email=user.email,
+                    alert={
+                        "title": alert.title,
+                        "message": alert.message,
+                        "action_suggestion": alert.action_suggestion,
+                        "pattern_type": alert.min_tier,
+                        "score": 70  # Default score
+                    },
+                    user_name=user.name
+                )
+
+        outcomes = await asyncio.gather(
+            *(send(alert, user) for alert, user in pending),
+            return_exceptions=True,
+        )
+
+        sent_count = 0
+        sent_at = datetime.utcnow()
+        for (alert, user), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to send alert email for alert {alert.id}: {outcome}")
+            # Failed sends stay pending and are retried next run
+            if outcome is not True:
+                continue
+            alert.email_sent = True
+            alert.email_sent_at = sent_at
+            sent_count += 1
+
+        await session.commit()
+        return sent_count
@@ -64,10 +64,14 @@ class ArbitrageDetector(PatternDetector):
         min_spread = self.get_config("min_spread", self.DEFAULT_MIN_SPREAD)
         similarity_threshold = self.get_config("title_similarity", self.DEFAULT_TITLE_SIMILARITY)
 
+        # Normalize each title once instead of once per pair
+        poly_titles = [self._normalize_title(p.title) for p in poly_markets]
+
         for kalshi in kalshi_markets:
-            for poly in poly_markets:
+            kalshi_title = self._normalize_title(kalshi.title)
+            for poly, poly_title in zip(poly_markets, poly_titles):
                 # Check if markets are for the same event
-                similarity = self._title_similarity(kalshi.title, poly.title)
+                similarity = self._title_similarity(kalshi_title, poly_title)
                 if similarity < similarity_threshold:
                     continue
 
@@ -112,26 +116,33 @@ class ArbitrageDetector(PatternDetector):
         # Look for markets that should have correlated prices
         # e.g., "Will X win?" and "Will X lose?" should sum to ~1.0
 
+        # Lowercase each title once and share it across every pair it appears in
+        titles = [m.title.lower() for m in markets]
+
         for i, m1 in enumerate(markets):
-            for m2 in markets[i + 1:]:
+            t1 = titles[i]
+            for j in range(i + 1, len(markets)):
+                m2 = markets[j]
+                t2 = titles[j]
+
                 # Check for inverse relationship
-                inverse = self._check_inverse_relationship(m1, m2)
+                inverse = self._check_inverse_relationship(m1, m2, t1, t2)
                 if inverse:
                     patterns.append(inverse)
 
                 # Check for subset relationship (e.g., "Win primary" vs "Win election")
-                subset = self._check_subset_relationship(m1, m2)
+                subset = self._check_subset_relationship(m1, m2, t1, t2)
                 if subset:
                     patterns.append(subset)
 
         return patterns
 
-    def _title_similarity(self, title1: str, title2: str) -> float:
-        """Calculate similarity between two market titles."""
-        # Normalize titles
-        t1 = title1.lower().strip()
-        t2 = title2.lower().strip()
+    def _normalize_title(self, title: str) -> str:
+        """Normalize a market title for similarity comparison."""
+        return title.lower().strip()
 
+    def _title_similarity(self, t1: str, t2: str) -> float:
+        """Calculate similarity between two normalized market titles."""
         # Use sequence matcher for fuzzy matching
         return SequenceMatcher(None, t1, t2).ratio()
 
@@ -179,7 +190,9 @@ class ArbitrageDetector(PatternDetector):
     def _check_inverse_relationship(
         self,
         m1: MarketData,
-        m2: MarketData
+        m2: MarketData,
+        t1: str,
+        t2: str,
     ) -> Optional[PatternResult]:
         """Check if two markets are inverses that should sum to 1."""
         if not m1.yes_price or not m2.yes_price:
@@ -194,9 +207,6 @@ class ArbitrageDetector(PatternDetector):
             ("before", "after"),
         ]
 
-        t1 = m1.title.lower()
-        t2 = m2.title.lower()
-
         is_inverse = False
         for w1, w2 in inverse_pairs:
             if (w1 in t1 and w2 in t2) or (w2 in t1 and w1 in t2):
@@ -251,16 +261,15 @@ class ArbitrageDetector(PatternDetector):
     def _check_subset_relationship(
         self,
         m1: MarketData,
-        m2: MarketData
+        m2: MarketData,
+        t1: str,
+        t2: str,
     ) -> Optional[PatternResult]:
         """Check if one market is a subset of another (should have lower probability)."""
         if not m1.yes_price or not m2.yes_price:
             return None
 
-        # Subset indicators: "and", "both", specific vs general
-        t1 = m1.title.lower()
-        t2 = m2.title.lower()
-
+        # Subset indicators: "and", "both", specific vs general (t1/t2 are lowercased titles)
         # Check if one is clearly more specific
         specificity_keywords = ["and", "both", "all", "every"]
 
@@ -1,16 +1,18 @@
 import logging
+from collections import defaultdict
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
 from sqlalchemy.dialects.postgresql import insert
 
 from app.models.market import Market, MarketSnapshot, Pattern as PatternModel, Platform
 from app.models.ai_insight import AIInsight, ArbitrageOpportunity, DailyDigest
 from app.core.database import AsyncSessionLocal
 from app.services.ai_agent import ai_agent
-from app.services.gemini_search import search_category_news
+from app.services.gemini_search import batch_search_categories
 
 from .base import PatternResult, MarketData
 from .volume import VolumePatternDetector
@@ -62,17 +64,35 @@ class PatternEngine:
         )
         markets = result.scalars().all()
 
+        # Latest `history_points` snapshots for every market in one query,
+        # instead of one round trip per market
+        snapshots_by_market: Dict[str, List[MarketSnapshot]] = defaultdict(list)
+        if markets:
+            ranked = (
+                select(
+                    MarketSnapshot,
+                    func.row_number().over(
+                        partition_by=MarketSnapshot.market_id,
+                        order_by=MarketSnapshot.timestamp.desc(),
+                    ).label("rn"),
+                )
+                .where(MarketSnapshot.market_id.in_([m.id for m in markets]))
+                .subquery()
+            )
+            snapshot_alias = aliased(MarketSnapshot, ranked)
+            snapshot_result = await session.execute(
+                select(snapshot_alias)
+                .where(ranked.c.rn <= history_points)
+                .order_by(snapshot_alias.market_id, snapshot_alias.timestamp)
+            )
+            for s in snapshot_result.scalars():
+                snapshots_by_market[s.market_id].append(s)
+
         market_data_list = []
 
         for market in markets:
-            # Get price/volume history
-            snapshot_result = await session.execute(
-                select(MarketSnapshot)
-                .where(MarketSnapshot.market_id == market.id)
-                .order_by(MarketSnapshot.timestamp.desc())
-                .limit(history_points)
-            )
-            snapshots = list(reversed(snapshot_result.scalars().all()))
+            # Price/volume history, oldest first
+            snapshots = snapshots_by_market.get(market.id, [])
 
             price_history = []
             volume_history = []
@@ -320,25 +340,19 @@ class PatternEngine:
 
         # Fetch news context for each category via Gemini web search
         logger.info("Fetching real news context via Gemini web search...")
-        category_news: Dict[str, Dict[str, Any]] = {}
-
-        for category, category_markets in market_by_category.items():
-            if len(category_markets) >= 3:
-                try:
-                    titles = [m["title"] for m in category_markets[:10]]
-                    logger.info(f"Fetching news for {category} ({len(titles)} market titles)...")
-                    category_news[category] = await search_category_news(category, titles)
-
-                    # Log results
-                    news = category_news[category]
-                    if news.get("error"):
-                        logger.warning(f"Gemini search error for {category}: {news['error']}")
-                    else:
-                        logger.info(f"Got {len(news.get('headlines', []))} headlines for {category}")
-
-                except Exception as e:
-                    logger.error(f"Failed to fetch news for {category}: {e}")
-                    category_news[category] = {"error": str(e), "headlines": []}
+        # Categories are searched concurrently
+        category_news: Dict[str, Dict[str, Any]] = await batch_search_categories({
+            category: [m["title"] for m in category_markets[:10]]
+            for category, category_markets in market_by_category.items()
+            if len(category_markets) >= 3
+        })
+
+        # Log results
+        for category, news in category_news.items():
+            if news.get("error"):
+                logger.warning(f"Gemini search error for {category}: {news['error']}")
+            else:
+                logger.info(f"Got {len(news.get('headlines', []))} headlines for {category}")
 
         # Analyze each category separately (with real news context!)
         categories_analyzed = 0
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.market import KalshiMarketData
+from app.services.data_collector import (
+    KALSHI_SNAPSHOT_COLUMNS,
+    KALSHI_UPDATE_COLUMNS,
+    UPSERT_BATCH_SIZE,
+    DataCollector,
+    _shape_kalshi_market,
+)
+
+
+class _FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _market_rows(count):
+    return {
+        f"kalshi_M{i}": dict(id=f"kalshi_M{i}", platform="kalshi", title=f"Market {i}", yes_price=0.5)
+        for i in range(count)
+    }
+
+
+def _rows_per_statement(session):
+    return [sum(name.startswith("id_m") for name in compiled.params) for compiled in session.statements]
+
+
+def test_upsert_markets_refreshes_update_columns_on_conflict():
+    session = _FakeSession()
+    asyncio.run(DataCollector()._upsert_markets(session, _market_rows(2), KALSHI_UPDATE_COLUMNS))
+
+    (compiled,) = session.statements
+    sql = str(compiled)
+    assert "ON CONFLICT (id) DO UPDATE SET" in sql
+    for column in KALSHI_UPDATE_COLUMNS:
+        assert f"{column} = excluded.{column}" in sql
+    # updated_at is set by the server, not bound per row
+    assert "updated_at = now()" in sql
+    assert not any(name.startswith("updated_at") for name in compiled.params)
+
+
+def test_upsert_markets_splits_batches_at_upsert_size():
+    session = _FakeSession()
+    asyncio.run(DataCollector()._upsert_markets(
+        session, _market_rows(UPSERT_BATCH_SIZE + 1), KALSHI_UPDATE_COLUMNS
+    ))
+
+    assert _rows_per_statement(session) == [UPSERT_BATCH_SIZE, 1]
+
+
+class _FakeDriverConnection:
+    def __init__(self):
+        self.copies = []
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        self.copies.append((table_name, list(records), columns))
+
+
+class _FakeCopySession:
+    """Exposes the session -> connection -> raw asyncpg connection chain _copy_snapshots walks."""
+
+    def __init__(self):
+        self.driver_connection = _FakeDriverConnection()
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+
+def test_copy_snapshots_copies_records_in_column_order():
+    market = KalshiMarketData(
+        ticker="FED-26JAN29",
+        title="Fed cut in January?",
+        yes_bid=0.40,
+        yes_ask=0.45,
+        volume=1200.0,
+        status="open",
+        close_time=datetime(2026, 1, 29, tzinfo=timezone.utc),
+    )
+    prepared = _shape_kalshi_market(market, "2026-01-01T00:00:00")
+    session = _FakeCopySession()
+
+    asyncio.run(DataCollector()._copy_snapshots(session, [prepared.snapshot], KALSHI_SNAPSHOT_COLUMNS))
+
+    ((table_name, records, columns),) = session.driver_connection.copies
+    assert table_name == "market_snapshots"
+    assert columns == KALSHI_SNAPSHOT_COLUMNS
+    (record,) = records
+    snapshot = dict(zip(columns, record))
+    assert snapshot.pop("spread") == pytest.approx(0.05)
+    assert snapshot == {
+        "market_id": "kalshi_FED-26JAN29",
+        "yes_price": 0.45,
+        "no_price": None,
+        "volume": 1200.0,
+        "best_bid": 0.40,
+        "best_ask": 0.45,
+    }
+
+
+def test_copy_snapshots_skips_empty_batches():
+    session = _FakeCopySession()
+    asyncio.run(DataCollector()._copy_snapshots(session, [], KALSHI_SNAPSHOT_COLUMNS))
+    assert session.driver_connection.copies == []
@@ -0,0 +1,145 @@
+import asyncio
+import types
+
+import httpx
+import pytest
+
+from app.services import kalshi_client as kc
+from app.services.kalshi_client import KalshiClient, TokenBucket, _retry, _retry_delay
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers, request=httpx.Request("GET", "https://kalshi.test/markets"))
+
+
+class _FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(kc, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(kc.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def test_rate_limited_halves_rate_down_to_min():
+    bucket = TokenBucket(rate=8.0, capacity=4, min_rate=2.0, recovery_step=0.5)
+    bucket.rate_limited()
+    assert bucket.rate == 4.0
+    bucket.rate_limited()
+    bucket.rate_limited()
+    assert bucket.rate == 2.0
+
+
+def test_succeeded_recovers_rate_up_to_max():
+    bucket = TokenBucket(rate=8.0, capacity=4, min_rate=2.0, recovery_step=0.5)
+    bucket.rate = 7.0
+    bucket.succeeded()
+    assert bucket.rate == 7.5
+    bucket.succeeded()
+    bucket.succeeded()
+    assert bucket.rate == 8.0
+
+
+def test_acquire_after_rate_limit_waits_from_the_429(clock):
+    bucket = TokenBucket(rate=4.0, capacity=4, min_rate=1.0, recovery_step=0.5)
+
+    async def run():
+        await bucket.acquire()
+        # A long idle gap before the 429 must not count toward the refill
+        clock.now += 60
+        bucket.rate_limited()
+        await bucket.acquire()
+
+    asyncio.run(run())
+    assert bucket.rate == 2.0
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_retry_delay_uses_retry_after():
+    assert _retry_delay(_response(429, {"Retry-After": "3"}), attempt=0) == 3.0
+
+
+def test_retry_delay_caps_retry_after():
+    assert _retry_delay(_response(429, {"Retry-After": "120"}), attempt=0) == kc.MAX_RETRY_DELAY
+
+
+@pytest.mark.parametrize("headers", [None, {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}, {"Retry-After": "-1"}])
+def test_retry_delay_falls_back_to_backoff(headers):
+    delay = _retry_delay(_response(429, headers), attempt=2)
+    assert 2.0 <= delay <= 2.2
+
+
+def test_retry_waits_out_429s_then_returns(clock):
+    calls = []
+
+    @_retry
+    async def request(self):
+        calls.append(1)
+        if len(calls) < 3:
+            response = _response(429, {"Retry-After": "2"})
+            raise httpx.HTTPStatusError("rate limited", request=response.request, response=response)
+        return "ok"
+
+    assert asyncio.run(request(None)) == "ok"
+    assert len(calls) == 3
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_retry_gives_up_after_max_retries(clock):
+    calls = []
+
+    @_retry
+    async def request(self):
+        calls.append(1)
+        response = _response(429)
+        raise httpx.HTTPStatusError("rate limited", request=response.request, response=response)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(request(None))
+    assert len(calls) == kc.RATE_LIMIT_RETRIES + 1
+
+
+def test_retry_does_not_retry_other_errors(clock):
+    calls = []
+
+    @_retry
+    async def request(self):
+        calls.append(1)
+        response = _response(500)
+        raise httpx.HTTPStatusError("server error", request=response.request, response=response)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(request(None))
+    assert len(calls) == 1
+    assert clock.sleeps == []
+
+
+def test_get_markets_backs_off_on_429(clock):
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "1"}),
+        httpx.Response(200, json={"markets": [], "cursor": None}),
+    ])
+    client = KalshiClient()
+    client._client = httpx.AsyncClient(
+        base_url="https://kalshi.test",
+        transport=httpx.MockTransport(lambda request: next(responses)),
+    )
+
+    assert asyncio.run(client.get_markets()) == {"markets": [], "cursor": None}
+    assert 1.0 in clock.sleeps
+    # Halved by the 429, then one recovery step for the success
+    assert client._limiter.rate == kc.REQUEST_RATE / 2 + kc.RATE_RECOVERY_STEP
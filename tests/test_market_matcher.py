@@ -0,0 +1,147 @@
+import asyncio
+from collections import namedtuple
+
+from rapidfuzz import fuzz
+from sqlalchemy.dialects import postgresql
+
+from app.services.market_matcher import (
+    MATCH_UPSERT_BATCH_SIZE,
+    MarketMatcher,
+    MatchCandidate,
+    _normalize_title,
+    _sort_tokens,
+)
+
+_Market = namedtuple(
+    "_Market", "id title category yes_price volume close_time", defaults=(0.5, 1000.0, None)
+)
+
+
+class _Result:
+    def __init__(self, flags):
+        self._flags = flags
+
+    def scalars(self):
+        return iter(self._flags)
+
+
+class _FakeSession:
+    """Answers the match upsert's RETURNING xmax = 0 as PostgreSQL would for a known set of rows."""
+
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(compiled)
+        match_ids = [value for name, value in compiled.params.items() if name.startswith("match_id_m")]
+        flags = [match_id not in self.existing for match_id in match_ids]
+        self.existing.update(match_ids)
+        return _Result(flags)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _candidate(match_id, yes_price=0.5):
+    return MatchCandidate(
+        kalshi=_Market(f"kalshi_{match_id}", f"Kalshi {match_id}", "Politics", yes_price),
+        polymarket=_Market(f"poly_{match_id}", f"Poly {match_id}", "politics", 0.4),
+        similarity=0.9,
+        combined_volume=2000.0,
+        match_id=match_id,
+    )
+
+
+def _rows_per_statement(session):
+    return [
+        sum(name.startswith("match_id_m") for name in compiled.params)
+        for compiled in session.statements
+    ]
+
+
+def _sorted_titles(markets):
+    return [_sort_tokens(_normalize_title(m.title)) for m in markets]
+
+
+def test_same_title_matches_across_category_labels():
+    title = "Will the Fed cut rates in March 2025?"
+    kalshi = [_Market("k1", title, "Economics")]
+    poly = [
+        _Market("p1", "Will Bitcoin hit $150k in 2025?", "Crypto"),
+        _Market("p2", title, "Fed Rates"),
+    ]
+
+    matcher = MarketMatcher(session=None)
+    best = matcher._best_matches_by_category(kalshi, _sorted_titles(kalshi), poly, _sorted_titles(poly))
+
+    assert best == [(1, 100.0)]
+
+
+def test_category_breaks_ties_between_equal_scores():
+    title = "Will the Fed cut rates in March 2025?"
+    kalshi = [_Market("k1", title, "Economics"), _Market("k2", title, None)]
+    poly = [_Market("p1", title, "Politics"), _Market("p2", title, "economics ")]
+
+    matcher = MarketMatcher(session=None)
+    best = matcher._best_matches_by_category(kalshi, _sorted_titles(kalshi), poly, _sorted_titles(poly))
+
+    # Uncategorized markets keep the earliest of the tied candidates
+    assert best == [(1, 100.0), (0, 100.0)]
+
+
+def test_better_cross_category_match_beats_same_category():
+    title = "Will the Fed cut rates in March 2025?"
+    kalshi = [_Market("k1", title, "Economics")]
+    poly = [
+        _Market("p1", "Will the Fed cut rates in May 2025?", "Economics"),
+        _Market("p2", title, "Fed Rates"),
+    ]
+
+    matcher = MarketMatcher(session=None)
+    sorted_poly = _sorted_titles(poly)
+    assert fuzz.ratio(_sorted_titles(kalshi)[0], sorted_poly[0]) >= matcher.similarity_threshold
+
+    best = matcher._best_matches_by_category(kalshi, _sorted_titles(kalshi), poly, sorted_poly)
+
+    assert best == [(1, 100.0)]
+
+
+def test_save_matches_counts_inserts_and_updates():
+    session = _FakeSession(existing={"fed-cut"})
+    matcher = MarketMatcher(session)
+
+    matches = [_candidate("fed-cut"), _candidate("btc-150k"), _candidate("btc-150k", 0.6), _candidate("senate")]
+    assert asyncio.run(matcher.save_matches(matches)) == (2, 1)
+
+    (compiled,) = session.statements
+    sql = str(compiled)
+    assert "ON CONFLICT (match_id) DO UPDATE" in sql
+    assert sql.endswith("RETURNING xmax = 0")
+    # The repeated match_id is sent once, with the later prices
+    assert _rows_per_statement(session) == [3]
+    assert compiled.params["kalshi_yes_price_m1"] == 0.6
+    assert session.commits == 1
+
+
+def test_save_matches_splits_batches_at_upsert_size():
+    session = _FakeSession()
+    matcher = MarketMatcher(session)
+    matches = [_candidate(f"match-{i}") for i in range(MATCH_UPSERT_BATCH_SIZE + 1)]
+
+    assert asyncio.run(matcher.save_matches(matches)) == (MATCH_UPSERT_BATCH_SIZE + 1, 0)
+    assert _rows_per_statement(session) == [MATCH_UPSERT_BATCH_SIZE, 1]
+
+    # A second run finds every match already stored
+    assert asyncio.run(matcher.save_matches(matches)) == (0, MATCH_UPSERT_BATCH_SIZE + 1)
+
+
+def test_save_matches_exact_batch_uses_one_statement():
+    session = _FakeSession()
+    matcher = MarketMatcher(session)
+    matches = [_candidate(f"match-{i}") for i in range(MATCH_UPSERT_BATCH_SIZE)]
+
+    assert asyncio.run(matcher.save_matches(matches)) == (MATCH_UPSERT_BATCH_SIZE, 0)
+    assert _rows_per_statement(session) == [MATCH_UPSERT_BATCH_SIZE]
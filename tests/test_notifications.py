@@ -0,0 +1,40 @@
+import asyncio
+
+from app.services import notifications
+from app.services.notifications import (
+    GREETING_HTML_SUBSTITUTION_TAG,
+    GREETING_TEXT_SUBSTITUTION_TAG,
+    NotificationService,
+)
+
+
+class _Response:
+    status_code = 202
+
+
+def test_digest_bulk_escapes_name_in_html_only(monkeypatch):
+    payloads = []
+
+    async def fake_post(payload):
+        payloads.append(payload)
+        return _Response()
+
+    monkeypatch.setattr(notifications, "post_to_sendgrid", fake_post)
+    service = NotificationService()
+    service.sendgrid_api_key = "test-key"
+
+    name = "<script>alert(1)</script>"
+    sent = asyncio.run(service.send_digest_bulk([("user@example.com", name)], []))
+
+    assert sent == 1
+    (payload,) = payloads
+    substitutions = payload["personalizations"][0]["substitutions"]
+    assert substitutions[GREETING_TEXT_SUBSTITUTION_TAG] == f"Hi {name},"
+    assert substitutions[GREETING_HTML_SUBSTITUTION_TAG] == "Hi &lt;script&gt;alert(1)&lt;/script&gt;,"
+
+    text_part, html_part = payload["content"]
+    assert text_part["type"] == "text/plain"
+    assert GREETING_TEXT_SUBSTITUTION_TAG in text_part["value"]
+    assert GREETING_HTML_SUBSTITUTION_TAG not in text_part["value"]
+    assert GREETING_HTML_SUBSTITUTION_TAG in html_part["value"]
+    assert GREETING_TEXT_SUBSTITUTION_TAG not in html_part["value"]